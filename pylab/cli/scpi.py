@@ -6,6 +6,7 @@ add COMMAND [FILE]: Add a command. Two arguments, COMMAND and optional FILE to a
 """
 
 import argparse
+import copy
 import pprint
 
 from pylab.utilities import list_data_files
@@ -100,7 +101,7 @@ def get_filename(indent=0):
 
 def load_file(filename,indent=0):
     try:
-        filedata = load_data_file(filename)
+        filedata = copy.deepcopy(load_data_file(filename)) # edited in place, so not the cached copy
     except FileNotFoundError:
         raise SystemExit(f"Selected file ({filename}) not found.")
     print(f"Loaded {filename}.")
@@ -26,14 +26,19 @@ class CommandSet(ABC):
     def __init__(self, _command_set_name) -> None:
         # Load common command set first, then overlay the provided device-specific commands
         self._command_set_name = _command_set_name
-        self._command_set = load_data_file(self.command_file_common)["commands"]
+        # copied, since load_data_file hands every caller the same cached data
+        self._command_set = dict(load_data_file(self.command_file_common)["commands"])
         
         device_command_set = load_data_file(self._command_set_name)
 
         self._command_set.update(device_command_set["commands"])
 
+        # command set is fixed after load, so sort/lowercase the names once for help lookups
+        self._sorted_keys = tuple(sorted(self._command_set.keys(), key=str.lower))
+        self._lowered_keys = tuple(k.lower() for k in self._sorted_keys)
+
     def __init_subclass__(cls, **kwargs):
-        super.__init_subclass__(**kwargs)
+        super().__init_subclass__(**kwargs)
 
         for attr in cls.required_attributes:
             if not hasattr(cls, attr):
@@ -52,23 +57,23 @@ class CommandSet(ABC):
         If one match is found, delegate to subclass print_command_info for full details.
         """
 
-        pattern = None
         if partial is None:
-            matches = list(self._command_set.keys())
+            matches = self._sorted_keys
+        elif re.escape(partial) == partial: # plain text, so a substring check is enough
+            partial_lowered = partial.lower()
+            matches = [cmd for cmd, lk in zip(self._sorted_keys, self._lowered_keys) if partial_lowered in lk]
         else: # actually search... otherwise we just print it all.
             try:
                 pattern = re.compile(partial, re.IGNORECASE)
             except re.error as exc:
                 print(f"Invalid regex '{partial}': {exc}")
                 return
-            matches = [cmd for cmd in self._command_set.keys() if pattern.search(cmd)]
+            matches = [cmd for cmd in self._sorted_keys if pattern.search(cmd)]
 
         if not matches: # nothing found, let 'em know and return it.
             print("No commands found.")
             return
 
-        matches.sort(key=str.lower)
-
         if len(matches) == 1: # one match, so use subclass to print full.
             self._help_command(matches[0])
             return
@@ -83,11 +83,105 @@ class SCPIArgumentValueError(SCPIError):
             base += f" Additional info: {self.info}"
         return base
 
+# accepted string forms of a bool argument, lowercase
+_BOOL_TOKENS = frozenset({"on", "off", "0", "1", "true", "false"})
+
+def _check_bool(argument):
+    if isinstance(argument, bool):
+        return True
+    if isinstance(argument, (int, float)):
+        return argument in (0, 1)
+    if isinstance(argument, str):
+        return argument.strip().lower() in _BOOL_TOKENS
+    return False
+
+def _check_int(argument):
+    return isinstance(argument, int) and not isinstance(argument, bool)
+
+def _check_float(argument):
+    return isinstance(argument, (int, float)) and not isinstance(argument, bool)
+
+def _check_str(argument):
+    return isinstance(argument, str)
+
+# argument definition type -> type check
+_TYPE_CHECKS = {
+    "bool": _check_bool,
+    "int": _check_int,
+    "float": _check_float,
+    "str": _check_str,
+}
+
+def _compile_argument_validator(argument_definition):
+    """
+    Build a validator for a single argument definition, with the definition's type check,
+    allowed values and range resolved up front.  The validator takes an argument and returns
+    (is_ok, error_kind), same as SCPICommandSet.validate_argument.
+
+    Definition errors (missing or unknown type) are raised when the validator is called, not
+    when it is built, so a bad definition only breaks the commands that use it.
+    """
+    expected_type = argument_definition.get("type")
+    type_check = _TYPE_CHECKS.get(expected_type)
+
+    allowed = argument_definition.get("values")
+    if allowed is not None:
+        allowed_upper = frozenset(v.upper() for v in allowed if isinstance(v, str))
+
+    low = high = None
+    if argument_definition.get("range") is not None:
+        try:
+            low, high = argument_definition["range"]
+        except Exception:
+            low = high = None
+    low = low if isinstance(low, (int, float)) else None
+    high = high if isinstance(high, (int, float)) else None
+
+    def validator(argument):
+        if expected_type is None:
+            raise SCPIArgumentError("Definition", argument_definition, info="Argument definition missing type")
+        if argument is None:
+            return False, "type"
+        if type_check is None:
+            raise SCPIArgumentError("Definition", argument_definition, info=f"Unknown argument type '{expected_type}'")
+        if not type_check(argument):
+            return False, "type"
+
+        # Enumerated allowed values
+        if allowed is not None:
+            if isinstance(argument, str):
+                if argument.upper() not in allowed_upper:
+                    return False, "value"
+            elif argument not in allowed:
+                return False, "value"
+
+        # Numeric range validation
+        if isinstance(argument, (int, float)) and not isinstance(argument, bool):
+            if low is not None and argument < low:
+                return False, "value"
+            if high is not None and argument > high:
+                return False, "value"
+
+        return True, None
+
+    return validator
+
 class SCPICommandSet(CommandSet):
     command_file_common = "SCPI_common"
 
     def __init__(self, command_set) -> None:
         super().__init__(command_set)
+
+        # base command -> (set meta, query meta, response definitions), built once so
+        # validate_command does not re-derive per-argument flags on every call.
+        self._cmd_meta = {name: (self._argument_meta(cmd_def.get("set")),
+                                 self._argument_meta(cmd_def.get("query")),
+                                 cmd_def.get("response"))
+                          for name, cmd_def in self._command_set.items()}
+        # id of each argument definition in the command set -> its compiled validator, so
+        # validate_argument can reuse them.  The command set keeps the definitions alive.
+        self._arg_validators = {id(d): v for meta in self._cmd_meta.values() for fmt in meta[:2]
+                                if fmt is not None for d, v in zip(fmt[0], fmt[3])}
   
     def get(self, command, default=None):
         """
@@ -106,61 +200,14 @@ class SCPICommandSet(CommandSet):
         Validates a single argument against the given argument definition.  Returns tuple (is_ok, error_kind)
         where error_kind is "value" when the value is outside accepted ranges/sets, "type" for other validation
         failures, and None when valid.
-        """
-        expected_type = argument_definition.get("type")
-        if expected_type is None:
-            raise SCPIArgumentError("Definition", argument_definition, info="Argument definition missing type")
-
-        if argument is None:
-            return False, "type"
-
-        # Basic type validation
-        if expected_type == "bool":
-            if isinstance(argument, bool):
-                pass
-            elif isinstance(argument, (int, float)) and not isinstance(argument, bool):
-                if argument not in (0, 1):
-                    return False, "type"
-            elif isinstance(argument, str):
-                if argument.strip().upper() not in {"ON", "OFF", "0", "1", "TRUE", "FALSE"}:
-                    return False, "type"
-            else:
-                return False, "type"
-        elif expected_type == "int":
-            if isinstance(argument, bool) or not isinstance(argument, int):
-                return False, "type"
-        elif expected_type == "float":
-            if isinstance(argument, bool) or not isinstance(argument, (int, float)):
-                return False, "type"
-        elif expected_type == "str":
-            if not isinstance(argument, str):
-                return False, "type"
-        else:
-            raise SCPIArgumentError("Definition", argument_definition, info=f"Unknown argument type '{expected_type}'")
-
-        # Enumerated allowed values
-        if "values" in argument_definition and argument_definition["values"] is not None:
-            allowed = argument_definition["values"]
-            if isinstance(argument, str):
-                if not any((isinstance(v, str) and v.upper() == argument.upper()) or v == argument for v in allowed):
-                    return False, "value"
-            else:
-                if argument not in allowed:
-                    return False, "value"
-
-        # Numeric range validation
-        if "range" in argument_definition and argument_definition["range"] is not None:
-            try:
-                low, high = argument_definition["range"]
-            except Exception:
-                low = high = None
-            if isinstance(argument, (int, float)) and not isinstance(argument, bool):
-                if low is not None and isinstance(low, (int, float)) and argument < low:
-                    return False, "value"
-                if high is not None and isinstance(high, (int, float)) and argument > high:
-                    return False, "value"
 
-        return True, None
+        Definitions from this command set use the validators compiled at load; any other
+        definition is compiled for this call.
+        """
+        validator = self._arg_validators.get(id(argument_definition))
+        if validator is None:
+            validator = _compile_argument_validator(argument_definition)
+        return validator(argument)
 
     def validate_command(self, command, *args):
         """
@@ -176,28 +223,32 @@ class SCPICommandSet(CommandSet):
         logger.debug("Validating SCPI command '%s' (query=%s) args=%s", command, is_query, args)
 
         try:
-            cmd_def = self._command_set[base]
+            set_meta, query_meta, response_defs = self._cmd_meta[base]
         except KeyError:
             logger.error("SCPI command '%s' not found in command set '%s'", base, self._command_set_name)
             raise SCPIUnknownCommandError(command, command_set_name=self._command_set_name, info="Base command not found.")
-        arg_defs = cmd_def.get("query" if is_query else "set")
+        arg_meta = query_meta if is_query else set_meta
 
-        if arg_defs is None:
+        if arg_meta is None:
             # None means not supported.  An empty list means supported but with no arguments.
             logger.error("SCPI command '%s' unsupported format (%s)", command, "query" if is_query else "set")
             raise SCPIUnknownCommandError(command, command_set_name=self._command_set_name, 
                                       info="Query format not supported." if is_query else "Set format not supported.")
+        arg_defs, arg_required, arg_variadic, arg_validators = arg_meta
+        arg_count = len(arg_defs)
 
-        response_defs = cmd_def.get("response")
         if is_query and response_defs is None:
             logger.error("SCPI command '%s' has query format but missing response definition", command)
             raise SCPIUnknownCommandError(command, command_set_name=self._command_set_name, 
                                       info="Command definition error: Query supported but no responce format set.")
 
+        if not arg_count and not args: # no parameters defined or given, nothing left to check
+            return command
+
         # check edge case where no args age given, and first arg is requied
         # The first agument will never be optional if future arguments are required.
-        if not len(args) and len(arg_defs):
-            if arg_defs[0].get("required", True):
+        if not len(args) and arg_count:
+            if arg_required[0]:
                 logger.error("SCPI command '%s' missing required arguments. Definitions: %s", command, arg_defs)
                 raise SCPIArgumentError(command, args, arg_defs, info=f"{self._command_set_name}: No arguments, but arguments required! {arg_defs}")
 
@@ -205,14 +256,14 @@ class SCPICommandSet(CommandSet):
         this_arg_def = 0
         matched_args = dict()  # def index -> list of provided values (keeps variadic order)
         for this_arg_val, this_arg in enumerate(args):
-            if this_arg_def >= len(arg_defs): # we ran out of definitions before we ran out of arguments... oops...
+            if this_arg_def >= arg_count: # we ran out of definitions before we ran out of arguments... oops...
                 logger.error("SCPI command '%s' provided too many arguments: %s for definitions %s", command, args, arg_defs)
                 raise SCPIArgumentError(command, args, arg_defs, info=f"{self._command_set_name}: Too many arguments supplied? {args} for {arg_defs}")
             matched_def_index = None
             last_error_kind = None
             # check arg against matched definition
-            for candidate_def_idx in range(this_arg_def, len(arg_defs)):
-                is_ok, error_kind = self.validate_argument(this_arg, arg_defs[candidate_def_idx])
+            for candidate_def_idx in range(this_arg_def, arg_count):
+                is_ok, error_kind = arg_validators[candidate_def_idx](this_arg)
                 if is_ok: # argument was OK - normalize, then exit inner loop. move onto next one.
                     matched_def_index = candidate_def_idx
                     matched_args.setdefault(candidate_def_idx, []).append(this_arg)
@@ -220,7 +271,7 @@ class SCPICommandSet(CommandSet):
                     break
                 else:
                     last_error_kind = error_kind
-                    if arg_defs[candidate_def_idx].get("required", True): # not OK, and not optional - ERROR
+                    if arg_required[candidate_def_idx]: # not OK, and not optional - ERROR
                         if error_kind == "value":
                             logger.error("SCPI command '%s' argument %s failed value validation against %s", command, this_arg, arg_defs[candidate_def_idx])
                             raise SCPIArgumentValueError(command, this_arg, arg_defs[candidate_def_idx], info=f"{self._command_set_name}: Unable to validate {this_arg} against definition {arg_defs[candidate_def_idx]}")
@@ -232,7 +283,7 @@ class SCPICommandSet(CommandSet):
                     raise SCPIArgumentValueError(command, this_arg, arg_defs[this_arg_def:], info=f"{self._command_set_name}: Unable to validate {this_arg} against any remaining argument definitions {arg_defs[this_arg_def:]}")
                 logger.error("SCPI command '%s' argument %s failed all remaining validations", command, this_arg)
                 raise SCPIArgumentError(command, this_arg, arg_defs[this_arg_def:], info=f"{self._command_set_name}: Unable to validate {this_arg} against any remaining argument definitions {arg_defs[this_arg_def:]}")
-            if arg_defs[matched_def_index].get("variadic", False): # accepts more than one - dont increment definition yet.
+            if arg_variadic[matched_def_index]: # accepts more than one - dont increment definition yet.
                 # these are always the last argument.
                 # because of this, edge case were there are arguments after this do not matter.
                 this_arg_def = matched_def_index
@@ -245,8 +296,8 @@ class SCPICommandSet(CommandSet):
             if def_idx in matched_args:
                 continue
             default_is_set = "default" in arg_def and arg_def.get("default") is not None
-            if (not arg_def.get("required", True)) and default_is_set:
-                is_ok, error_kind = self.validate_argument(arg_def["default"], arg_def)
+            if (not arg_required[def_idx]) and default_is_set:
+                is_ok, error_kind = arg_validators[def_idx](arg_def["default"])
                 if not is_ok:
                     if error_kind == "value":
                         logger.error("SCPI command '%s' default value %s failed value validation against %s", command, arg_def["default"], arg_def)
@@ -258,18 +309,31 @@ class SCPICommandSet(CommandSet):
 
         # Build command string
         cleaned_args = list()
-        for def_idx, arg_def in enumerate(arg_defs):
+        for def_idx in range(arg_count):
             if def_idx not in matched_args:
                 continue
-            if arg_def.get("variadic", False):
+            if arg_variadic[def_idx]:
                 cleaned_args.extend(matched_args[def_idx])
             else:
                 cleaned_args.append(matched_args[def_idx][0])
-        args_string = ",".join(str(a) for a in cleaned_args)
+        args_string = ",".join([a if type(a) is str else str(a) for a in cleaned_args]) # list lets join size once
         cmd_string =  f"{command} " + args_string
         logger.debug("SCPI command '%s' formatted as: %s", command, cmd_string.strip())
         return cmd_string.strip()
 
+    @staticmethod
+    def _argument_meta(arg_defs):
+        """
+        Precompute (arg_defs, required flags, variadic flags, argument validators) for one
+        command format, or None when the format is not supported.
+        """
+        if arg_defs is None:
+            return None
+        return (arg_defs,
+                tuple(d.get("required", True) for d in arg_defs),
+                tuple(d.get("variadic", False) for d in arg_defs),
+                tuple(_compile_argument_validator(d) for d in arg_defs))
+
     def _help_command(self, command):
         """
         Print detailed information about a SCPI command from the command set.
@@ -26,6 +26,10 @@ from .connection import Status
 # Update this to change the default resource manager
 RESOURCEMANAGER = '@py'
 
+# Default read chunk size in bytes.  pyvisa's default (20kB) splits larger responses
+# into many low level reads, so go a bit bigger.
+CHUNK_SIZE = 102400
+
 class ResourceManager(object):
     """VISA resource manager singleton.  Should really never be instantiated by users"""
     _instance = None
@@ -81,9 +85,10 @@ class ResourceManager(object):
         return self.manager.list_resources()
 
 class VISAConnection(Connection):
-    def __init__(self, name, address, timeout=5) -> None:
+    def __init__(self, name, address, timeout=5, chunk_size=CHUNK_SIZE) -> None:
         super().__init__(name, address)
         self._timeout = timeout
+        self._chunk_size = chunk_size
         self._pyvisa_manager = ResourceManager()
         self._pyvisa_resource = None
 
@@ -91,6 +96,7 @@ class VISAConnection(Connection):
         logger.info(f"{self}: Opening...")
         self._pyvisa_resource = self._pyvisa_manager.open(self.address)
         self.timeout = self._timeout
+        self.chunk_size = self._chunk_size
         self._status = Status.OPEN
         logger.info(f"{self}: Opened as {self._pyvisa_resource}... testing connection")
         resp = self.query("*IDN?")
@@ -125,7 +131,7 @@ class VISAConnection(Connection):
 
     def read(self) -> str | None:
         if not self:
-            logger.error(f"{self}: Unable to write to connection... status is {self.status}")
+            logger.error("%s: Unable to write to connection... status is %s", self, self.status)
             return None
         
         try:
@@ -133,12 +139,12 @@ class VISAConnection(Connection):
             return response.strip()
         except Exception as e:
             self._status = Status.UNKNOWN
-            logger.error(f"{self} failed to read command with {e} - setting status to UNKNOWN")
+            logger.error("%s failed to read command with %s - setting status to UNKNOWN", self, e)
             return None
     
     def write(self, command) -> bool:
         if not self:
-            logger.error(f"{self}: Unable to write to connection... status is {self.status}")
+            logger.error("%s: Unable to write to connection... status is %s", self, self.status)
             return False
         
         try:
@@ -146,14 +152,14 @@ class VISAConnection(Connection):
             return True
         except Exception as e:
             self._status = Status.UNKNOWN
-            logger.error(f"{self} failed to write command {command} with {e} - setting status to UNKNOWN")
+            logger.error("%s failed to write command %s with %s - setting status to UNKNOWN", self, command, e)
             return False
     
     def query(self, command) -> str | None:
         if self and (self._pyvisa_resource is not None):
             return self._pyvisa_resource.query(command)
         else:
-            logger.error(f"{self}: Status is not open - unable to query.")
+            logger.error("%s: Status is not open - unable to query.", self)
             return None
 
     @property
@@ -171,15 +177,31 @@ class VISAConnection(Connection):
             except Exception as e:
                 logger.error(f"{self}: Failed to set timout value with {e}")
 
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, val):
+        if val <= 0:
+            raise ValueError(f"{self}: Chunk size must be > 0")
+        self._chunk_size = val
+        if self._pyvisa_resource is not None:
+            try:
+                self._pyvisa_resource.chunk_size = self._chunk_size
+            except Exception as e:
+                logger.error(f"{self}: Failed to set chunk size with {e}")
+
 class VISAConnectionTester(Connection):
     """
     Lightweight test double for VISA connections that mirrors the public API of VISAConnection.
     Responses are always coerced to strings to mimic VISA behavior.
     """
 
-    def __init__(self, name, address, timeout=5) -> None:
+    def __init__(self, name, address, timeout=5, chunk_size=CHUNK_SIZE) -> None:
         super().__init__(name, address)
         self._timeout = timeout
+        self._chunk_size = chunk_size
         self._response_queue = []
 
     def open(self) -> Status:
@@ -198,22 +220,22 @@ class VISAConnectionTester(Connection):
 
     def read(self, *, response=None) -> str | None:
         if not self:
-            logger.error(f"{self}: Unable to read... status is {self.status}")
+            logger.error("%s: Unable to read... status is %s", self, self.status)
             return None
         return self._next_response(response)
 
     def write(self, command, *args, **kwargs) -> bool:
         if not self:
-            logger.error(f"{self}: Unable to write to connection... status is {self.status}")
+            logger.error("%s: Unable to write to connection... status is %s", self, self.status)
             return False
-        logger.info(f"{self}: Placeholder write of command {command}")
+        logger.info("%s: Placeholder write of command %s", self, command)
         return True
 
     def query(self, command=None, *, response=None) -> str | None:
         if not self:
-            logger.error(f"{self}: Status is not open - unable to query.")
+            logger.error("%s: Status is not open - unable to query.", self)
             return None
-        logger.info(f"{self}: Placeholder query for command {command}")
+        logger.info("%s: Placeholder query for command %s", self, command)
         return self._next_response(response)
 
     def queue_response(self, *responses) -> None:
@@ -231,13 +253,23 @@ class VISAConnectionTester(Connection):
             raise ValueError(f"{self}: Timeout must be > 0")
         self._timeout = val
 
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, val):
+        if val <= 0:
+            raise ValueError(f"{self}: Chunk size must be > 0")
+        self._chunk_size = val
+
     def _next_response(self, provided) -> str:
         if provided is not None:
             return self._coerce_response(provided)
         if self._response_queue:
             return self._response_queue.pop(0)
         fallback = random.random()
-        logger.warning(f"{self}: No response provided; returning random placeholder value {fallback}")
+        logger.warning("%s: No response provided; returning random placeholder value %s", self, fallback)
         return f"{fallback}"
 
     @staticmethod
@@ -3,19 +3,134 @@ Abstract base classes for devices.  Should never be instantiated alone.  Use by
 to ensure a consistent interface.
 """
 
+import functools
 import logging
-from abc import ABC, abstractmethod
+import time
+import weakref
 from ..communication import getConnection
 from ..communication import getCommandSet
 
 logger = logging.getLogger(__name__)
 
-class Device(ABC):
+# Number of validated command strings kept around, shared by all devices
+COMMAND_CACHE_SIZE = 1024
+
+# (connection type, address) -> [connection, number of devices using it, query cache]
+_CNX_POOL = dict()
+
+def _acquire_connection(name, cnx_type, cnx_address, **cnx_args):
+    """
+    Get an open connection for a device, reusing one from the pool when another device
+    already has the same connection type and address open.  The first device's connection
+    arguments are the ones used.  Connections without an address are never pooled.
+
+    Returns (connection, query cache).  The query cache (query key -> (time of query,
+    response)) belongs to the connection, so every device on it sees the others' writes.
+    """
+    key = (getattr(cnx_type, "name", cnx_type), cnx_address)
+    entry = _CNX_POOL.get(key) if cnx_address is not None else None
+    if entry is not None and entry[0]:
+        entry[1] += 1
+        logger.debug("Reusing pooled connection %s (%d users)", entry[0], entry[1])
+        return entry[0], entry[2]
+
+    cnx = getConnection(cnx_type)(name, cnx_address, **cnx_args)
+    try:
+        cnx.open()
+    except Exception as e:
+        logger.error(f"Failed to open connection with {e}")
+    if not cnx:
+        raise RuntimeError(f"Unable to open connection to instrument!")
+    query_cache = dict()
+    if cnx_address is not None:
+        _CNX_POOL[key] = [cnx, 1, query_cache]
+    return cnx, query_cache
+
+def _release_connection(cnx):
+    """
+    Drop one device's use of a connection, closing it once no devices are left using it.
+    Connections that are not in the pool are just closed.  Registered with weakref.finalize
+    for each device, so this must not hold a reference to the device itself.
+    """
+    for key, entry in _CNX_POOL.items():
+        if entry[0] is cnx:
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del _CNX_POOL[key]
+            break
+    try:
+        cnx.close()
+    except Exception as e:
+        logger.warning(f"{cnx.name} failed to close connection: {e}")
+
+# (command set type, command file) -> loaded command set, shared read only between devices
+_CMDSET_CACHE = dict()
+
+def _get_command_set(cmd_type, cmd_file):
+    """Get the command set for a device, loading and parsing each command file only once."""
+    key = (getattr(cmd_type, "name", cmd_type), cmd_file)
+    cmd_set = _CMDSET_CACHE.get(key)
+    if cmd_set is None:
+        cmd_set = _CMDSET_CACHE[key] = getCommandSet(cmd_type)(cmd_file)
+    return cmd_set
+
+@functools.lru_cache(maxsize=COMMAND_CACHE_SIZE, typed=True)
+def _validate(cmd_set, command, *args):
+    """
+    Cached validate_command.  Keyed on the command set itself, so a replaced command set
+    never gets another's results.
+    """
+    return cmd_set.validate_command(command, *args)
+
+class _CommandProperty(object):
+    """
+    Data descriptor for a single command map entry.  Gets issue a query, sets issue a write.
+    Entries missing a write or query command use the read/write-only subclasses below, so
+    the None checks happen once at class creation instead of on every access.
+    """
+    def __init__(self, name, write_key, query_key) -> None:
+        self.name = name
+        self.write_key = write_key
+        self.query_key = query_key
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance._query(self.query_key)
+
+    def __set__(self, instance, value):
+        instance._cnx_write(instance._command_string(self.write_key, value))
+        instance._query_cache.clear()
+
+class _ReadOnlyCommandProperty(_CommandProperty):
+    def __set__(self, instance, value):
+        raise AttributeError(f"{instance.name}: Command '{self.name}' is read-only or not implemented.")
+
+class _WriteOnlyCommandProperty(_CommandProperty):
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        raise AttributeError(f"{instance.name}: Command '{self.name}' is write-only or not implemented.")
+
+class _UnimplementedCommandProperty(_ReadOnlyCommandProperty, _WriteOnlyCommandProperty):
+    pass
+
+def _command_property(name, write_key, query_key):
+    """Pick the descriptor class for a command map entry based on which commands it has."""
+    if write_key is None:
+        prop_cls = _UnimplementedCommandProperty if query_key is None else _ReadOnlyCommandProperty
+    else:
+        prop_cls = _WriteOnlyCommandProperty if query_key is None else _CommandProperty
+    return prop_cls(name, write_key, query_key)
+
+class Device(object):
     """
     Abstract base class for all devices.
     Ensures consistent interface for device communication and command validation.
 
-    Concrete device classes must define the following class attributes:
+    Concrete device classes must define the following class attributes (checked when the
+    class is created, skipped for bases that set _abstract = True in their own body):
         - command_file: str - The command set file name for the device.
         - command_map: dict - A mapping of device common commands to their 
             device specific definitions.
@@ -25,65 +140,61 @@ class Device(ABC):
 
     Command map entries are tuples of (write_command_key, query_command_key).
 
+    Devices with the same connection type and address share one open connection, which is
+    closed when the last of them is garbage collected.  Closing or resetting the connection from one
+    device affects all of them.
+
+    Queries listed in query_cache_ttl (query key -> seconds) are answered from a cache for
+    that long after the last real query.  Any write clears the cache, since it may have
+    changed the state being cached.  The cache is shared by all devices on a connection, so a
+    write through one clears it for the others too.  Queries not listed are never cached.
+
+    Devices use __slots__, so setting an attribute that is not a command map entry or an
+    existing attribute raises AttributeError rather than silently adding a new one.  Subclasses
+    should define __slots__ = () (or list any new instance attributes) to keep this.
+
     """
 
+    __slots__ = ("_name", "_cnx", "_cmd", "_cnx_write", "_cnx_read", "_query_cache", "__weakref__")
+
     required_attributes = ["command_file", "command_map"]
+    query_cache_ttl = {"*IDN?": float("inf")}
+    measure_names = ("voltage", "current", "power") # command map entries read by measure_all
 
     def __init__(self, name, cnx_type, cnx_address, cmd_type, cmd_file, **cnx_args) -> None:
+        if type(self).__dict__.get("_abstract", False):
+            raise TypeError(f"Can't instantiate abstract device class {type(self).__name__}")
         super().__init__()
 
-        self._cnx = getConnection(cnx_type)(name, cnx_address, **cnx_args)
-        try:
-            self._cnx.open()
-        except Exception as e:
-            logger.error(f"Failed to open connection with {e}")
-        if not self._cnx:
-            raise RuntimeError(f"Unable to open connection to instrument!")
-        self._cmd = getCommandSet(cmd_type)(cmd_file)
+        self._name = name
+        self._cnx, self._query_cache = _acquire_connection(name, cnx_type, cnx_address, **cnx_args)
+        weakref.finalize(self, _release_connection, self._cnx)
+        self._cmd = _get_command_set(cmd_type, cmd_file)
+        # bound once here so command properties skip the write/query/read wrappers
+        self._cnx_write = self._cnx.write
+        self._cnx_read = self._cnx.read
 
     def __init_subclass__(cls, **kwargs):
-        super.__init_subclass__(**kwargs)
+        super().__init_subclass__(**kwargs)
+
+        if cls.__dict__.get("_abstract", False): # Load, Source, etc. leave these to concrete devices
+            return
 
         for attr in cls.required_attributes:
             if not hasattr(cls, attr):
                 raise TypeError(f"{cls.__name__} must define '{attr}'") 
 
-    def __setattr__(self, name, value):
-        if name in ("command_map", "__dict__", "__class__"): # these items should NOT get intercepted...
-            object.__setattr__(self, name, value)
-            return
+        cls._compound_commands = dict() # tuple of command map names -> (names queried, compound query string)
 
-        cmd_map = object.__getattribute__(self, "command_map") # since we are intercepting here...
-        if name in cmd_map:
-            write_key, _ = cmd_map[name]
-            if write_key is None:
-                raise AttributeError(f"{self.name}: Command '{name}' is read-only or not implemented.")
-            self.write(write_key, value)
-        else: # not in map... just try normal set
-            try: # only allow set if it already exists, otherwise prevent.  Avoids missnaming built ins and having ussues from that.
-                _ = object.__getattribute__(self, name)
-            except AttributeError as e:
-                raise AttributeError(f"Cannot add new property {name}") from e
-            object.__setattr__(self, name, value)
-
-    def __getattribute__(self, name):
-        if name in ("command_map", "write", "query", "__dict__", "__class__",
-            "__setattr__", "__getattribute__", ): # these items should NOT get intercepted...
-            return object.__getattribute__(self, name)
-
-        cmd_map = object.__getattribute__(self, "command_map") # since we are intercepting here...
-        if name in cmd_map:
-            _, query_key = cmd_map[name]
-            if query_key is None:
-                raise AttributeError(f"{self.name}: Command '{name}' is write-only or not implemented.")
-            query = object.__getattribute__(self, "query") # again skip normals since we intercept...
-            return query(query_key)
-        else: # not in map... just do normal stuff...
-            return object.__getattribute__(self, name)
+        has_cmd_map = isinstance(cls.command_map, dict) and bool(cls.command_map)
+        if has_cmd_map and "command_map" in cls.__dict__:
+            # install one descriptor per command map entry, so only those names pay for a command
+            for name, (write_key, query_key) in cls.command_map.items():
+                setattr(cls, name, _command_property(name, write_key, query_key))
 
     @property
     def name(self):
-        return self._cnx.name
+        return self._name
     
     @property
     def address(self):
@@ -97,6 +208,20 @@ class Device(ABC):
         """Return the raw command definition from the validator."""
         return self._cmd.get(command)
 
+    def _command_string(self, command, *args):
+        """
+        Validate a command against the command set and return the string to send.
+
+        Validated command strings are kept in a bounded LRU cache keyed on (command set,
+        command, args), so sweeps that repeat values only pay for validation the first time,
+        and devices sharing a command set share hits.  The cache is typed, so 1 and 1.0 are
+        validated separately.
+        """
+        try:
+            return _validate(self._cmd, command, *args)
+        except TypeError: # unhashable arguments, so just validate every time
+            return self._cmd.validate_command(command, *args)
+
     def write(self, command, *args):
         """
         Write a command to the device after validating against the command set.
@@ -109,8 +234,8 @@ class Device(ABC):
         Returns:
             bool: True if write succeeded, False otherwise
         """
-        cmd_str = self._cmd.validate_command(command, *args)
-        self._cnx.write(cmd_str)
+        self._cnx_write(self._command_string(command, *args))
+        self._query_cache.clear()
         return True
         
     def read(self):
@@ -119,7 +244,7 @@ class Device(ABC):
         Raises:
             Exception: If the read operation fails
         """
-        return self._cnx.read()
+        return self._cnx_read()
         
     def query(self, command, *args):
         """
@@ -128,8 +253,65 @@ class Device(ABC):
             command (str): The command key to send (must be in command_set)
             *args: Arguments to fill in for the command parameters
         """
-        self.write(command, *args)
-        return self.read()
+        return self._query(command, *args)
+
+    def _query(self, command, *args):
+        """
+        Query without the public wrapper.  Queries with a TTL in query_cache_ttl (and no
+        arguments) are served from the query cache while still fresh.
+        """
+        ttl = 0 if args else self.query_cache_ttl.get(command, 0)
+        if ttl:
+            now = time.monotonic()
+            cached = self._query_cache.get(command)
+            if cached is not None and now - cached[0] < ttl:
+                return cached[1]
+
+        self._cnx_write(self._command_string(command, *args))
+        response = self._cnx_read()
+        if ttl and response is not None:
+            self._query_cache[command] = (now, response)
+        return response
+
+    def measure_all(self):
+        """Read the measure_names entries in one compound query.  Returns dict of name -> response."""
+        return self._compound_query(self.measure_names)
+
+    def _compound_query(self, names):
+        """
+        Query several command map entries with a single compound SCPI query, e.g.
+        'MEAS:VOLT?;:MEAS:CURR?', so they cost one bus round trip instead of one each.
+        Names not in the command map, without a query command, or whose query is not in the
+        command set (or has no query format there) are skipped.
+
+        Returns a dict of name -> response string.
+        """
+        compound = self._compound_commands.get(names)
+        if compound is None: # check and validate each part once per class, then reuse
+            used = list()
+            for name in names:
+                query_key = self.command_map.get(name, (None, None))[1]
+                if query_key is None:
+                    continue
+                # the command must be in the command set and define a query format
+                if not query_key.endswith("?") or (self._cmd.get(query_key[:-1]) or {}).get("query") is None:
+                    logger.warning(f"{self.name}: Skipping '{name}' in compound query, '{query_key}' is not a query in the command set")
+                    continue
+                used.append(name)
+            cmd_str = ";:".join(self._command_string(self.command_map[n][1]) for n in used)
+            compound = self._compound_commands[names] = (tuple(used), cmd_str)
+        names, cmd_str = compound
+        if not names:
+            return dict()
+
+        self._cnx_write(cmd_str)
+        response = self._cnx_read()
+        if response is None:
+            return dict.fromkeys(names)
+        values = response.split(";")
+        if len(values) != len(names):
+            logger.error(f"{self.name}: Expected {len(names)} responses to '{cmd_str}', got {response}")
+        return dict(zip(names, values))
 
     def open_connection(self):
         """Open the underlying connection."""
@@ -143,31 +325,13 @@ class Device(ABC):
         """Reset the underlying connection."""
         return self._cnx.reset()
 
-    def __del__(self):
-        try:
-            self._cnx.close()
-        except:
-            logger.warning(f"{self.name} failed to close connection in __del__")
-
 class Load(Device):
-    @property
-    @abstractmethod
-    def command_file(self) -> str:
-        pass
+    __slots__ = ()
 
-    @property
-    @abstractmethod
-    def command_map(self) -> dict:
-        pass
+    _abstract = True
 
 class Source(Device):
-    @property
-    @abstractmethod
-    def command_file(self) -> str:
-        pass
+    __slots__ = ()
 
-    @property
-    @abstractmethod
-    def command_map(self) -> dict:
-        pass
+    _abstract = True
 
@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 from .base import Load, Source
 
 class BK8616(Load):
+    __slots__ = ()
+
     command_file = "SCPI_BK8616" # type: ignore
 
     command_map = {  # type: ignore
@@ -14,23 +16,28 @@ class BK8616(Load):
         "mode": ("FUNC", "FUNC?"),
         "voltage": ("VOLT", "MEAS:VOLT?"),
         "current": ("CURR", "MEAS:CURR?"),
-        "power": ("POW", "MEAS:POW?")
+        "power": ("POW", None)  # no power measurement in this command file
     } 
 
+    # input state and mode only change when we set them, so skip re-querying for a moment
+    query_cache_ttl = {"*IDN?": float("inf"), "INP?": 1.0, "FUNC?": 1.0}
+
     def __init__(self, name, address, cnx_type="VISA", cmd_type="SCPI", **cnx_args) -> None:
         super().__init__(name, cnx_type, address, cmd_type, self.command_file, **cnx_args)
 
     
 class BK9129B(Source):
+    __slots__ = ()
+
     command_file = "SCPI_BK9129B"  # type: ignore
 
     command_map = {  # type: ignore
         "enabled": ("OUTP", "OUTP:STAT?"),
-        "voltage": ("VOLT", "MEAS:VOLT"),
+        "voltage": ("VOLT", "MEAS:VOLT?"),
         "current": ("CURR", "MEAS:CURR?"),
         "power": ("POW", "MEAS:POW?")
     }
         
-    def __init__(self, name, address, connection_type="VISA", **connection_args) -> None:
-        super().__init__(name, address, connection_type, **connection_args)
+    def __init__(self, name, address, cnx_type="VISA", cmd_type="SCPI", **cnx_args) -> None:
+        super().__init__(name, cnx_type, address, cmd_type, self.command_file, **cnx_args)
     
@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 from .base import Source
 
 class N5770A(Source):
+    __slots__ = ()
+
     command_file = "SCPI_N5770A"
     command_map = {
         "enabled": ("OUTP", "OUTP:STAT?"),
@@ -15,5 +17,8 @@ class N5770A(Source):
         "power": (None, None)  # Power control not implemented in this command file
     }
 
-    def __init__(self, name, address, connection_type="VISA", **connection_args) -> None:
-        super().__init__(name, address, connection_type, **connection_args)
+    # output state only changes when we set it, so skip re-querying for a moment
+    query_cache_ttl = {"*IDN?": float("inf"), "OUTP:STAT?": 1.0}
+
+    def __init__(self, name, address, cnx_type="VISA", cmd_type="SCPI", **cnx_args) -> None:
+        super().__init__(name, cnx_type, address, cmd_type, self.command_file, **cnx_args)
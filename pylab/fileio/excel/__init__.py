@@ -25,12 +25,14 @@ if sys.platform != "win32":
 try:
     import win32com.client
     import pywintypes
+    import pythoncom
 except ImportError as e:
     raise PyWin32NotInstalledError() from e
 
 try:
-    # Test with a simple COM object
-    win32com.client.Dispatch("Scripting.Dictionary")
+    # Check the COM runtime is usable (Excel's type library IID) without starting a COM server.
+    # Excel itself is only checked when it is first started.
+    pywintypes.IID("{00020813-0000-0000-C000-000000000046}")
 except Exception as e:
     raise PyWin32NotInstalledError(
         "pywin32 is installed but may not be properly configured.\n\n"
@@ -38,4 +40,4 @@ except Exception as e:
         "    python Scripts/pywin32_postinstall.py -install\n\n"
         f"Error details: {str(e)}") from e
 
-from .workbook import Workbook
\ No newline at end of file
+from .workbook import Workbook, from_oadate
\ No newline at end of file
@@ -2,39 +2,174 @@
 Examples of creating and opening Excel files using pywin32 with a single application instance.
 """
 
-import win32com.client
+from win32com.client import gencache, CastTo, Dispatch
+import pythoncom
+import pywintypes
 import os
+import sys
+import shutil
 import atexit
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 
 import logging
 logger = logging.getLogger(__name__)
 
+XL_CALCULATION_MANUAL = -4135
+MSO_AUTOMATION_SECURITY_FORCE_DISABLE = 3
+
+# SaveAs FileFormat values by file extension
+FILE_FORMATS = {
+    ".xlsb": 50, # binary workbook, smaller and faster to load/save than .xlsx
+    ".xlsx": 51,
+    ".xlsm": 52,
+    ".xls": 56,
+}
+
+def save_as(workbook, filepath, file_format=None):
+    """
+    SaveAs for a workbook object.  The file format is taken from file_format if given, else
+    from the extension via FILE_FORMATS, else left to Excel's default.
+    """
+    abs_path = os.path.abspath(filepath)
+    if file_format is None:
+        file_format = FILE_FORMATS.get(os.path.splitext(abs_path)[1].lower())
+    if file_format is None:
+        workbook.SaveAs(abs_path)
+    else:
+        workbook.SaveAs(abs_path, FileFormat=file_format)
+
+# per thread record of whether this module called CoInitialize on it
+_com_state = threading.local()
+
+def ensure_com_initialized():
+    """
+    Initialize COM on the calling thread if it has not been already.  pythoncom does this for
+    the main thread on import, but worker threads must do it themselves before any COM call.
+    """
+    if not getattr(_com_state, "initialized", False):
+        if threading.current_thread() is not threading.main_thread():
+            pythoncom.CoInitialize()
+            _com_state.owned = True
+        _com_state.initialized = True
+
+def early_bound(obj, interface):
+    """
+    Cast a COM object to its generated early-bound interface (e.g. '_Worksheet').  Collections
+    like Worksheets return plain IDispatch items, which pywin32 wraps late-bound even when the
+    application itself is early-bound.  Objects that can't be cast are returned unchanged.
+    """
+    try:
+        return CastTo(obj, interface)
+    except Exception:
+        return obj
+
+def _close_marshalled(stream, save_changes):
+    """Worker side of close_workbook_async: unmarshal the workbook on this thread and close it."""
+    pythoncom.CoInitialize()
+    try:
+        workbook = Dispatch(pythoncom.CoGetInterfaceAndReleaseStream(stream, pythoncom.IID_IDispatch))
+        workbook.Close(SaveChanges=save_changes)
+        del workbook
+    except Exception as e:
+        logger.error(f"Error closing workbook in background: {e}")
+        raise
+    finally:
+        pythoncom.CoUninitialize()
+
+def _ensure_dispatch(prog_id):
+    """
+    Early-bound dispatch (makepy wrappers from gencache), so attribute access uses known
+    DISPIDs instead of a GetIDsOfNames round trip each time.  A stale gen_py cache shows up
+    as an AttributeError (e.g. CLSIDToClassMap); clear it and retry once.
+    """
+    try:
+        return gencache.EnsureDispatch(prog_id)
+    except AttributeError as e:
+        gen_path = gencache.GetGeneratePath()
+        logger.warning(f"Stale win32com gen_py cache ({e}), clearing {gen_path} and retrying")
+        for module in [m for m in sys.modules if m.startswith("win32com.gen_py.")]:
+            del sys.modules[module]
+        shutil.rmtree(gen_path, ignore_errors=True)
+        return gencache.EnsureDispatch(prog_id)
+
 class _app_singleton:
     """
     Singleton-like class to manage a single Excel application instance.
     Reuses the same Excel instance for all workbook operations.
+
+    Excel is only started on first use of app (opening or creating a workbook, etc.), not
+    when this module is imported, so importing for address math never launches excel.exe.
+    Once started it stays running across workbook opens and closes, so only the first open
+    pays for starting Excel.  It is quit at interpreter exit, or earlier with release().
+
+    Creating the singleton and starting Excel are locked, and COM is initialized on whichever
+    thread uses it.  Excel itself is single threaded (STA), so calls from other threads are
+    marshalled and serialize; a workbook is best used from the thread that opened it.  For
+    real parallelism use multiple processes, each of which gets its own Excel instance.
     """
     
     _instance = None
+    _instance_lock = threading.Lock()
     _app = None
+    _hwnd = None
+    _app_lock = threading.Lock()
+    _quit_registered = False
+    _executor = None # background workbook closes, created on first close_workbook_async
+    _bulk_depth = 0
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        if self._app is None:
-            self._app = win32com.client.Dispatch("Excel.Application")
-            self._app.DisplayAlerts = False  # Suppress prompts
-            atexit.register(self.quit)
+    def _start(self):
+        """Launch Excel.  The quit hook is only registered once Excel has actually been started."""
+        ensure_com_initialized()
+        with self._app_lock:
+            if self._app is None:
+                app = _ensure_dispatch("Excel.Application")
+                app.DisplayAlerts = False  # Suppress prompts
+                app.AskToUpdateLinks = False
+                app.AutomationSecurity = MSO_AUTOMATION_SECURITY_FORCE_DISABLE # don't run macros in opened files
+                self._app = app
+                self._hwnd = app.Hwnd
+                if not self._quit_registered:
+                    atexit.register(self.quit)
+                    _app_singleton._quit_registered = True
+                logger.info("Excel application started")
+        return self._app
     
     @property
     def app(self):
-        """Get the Excel application instance."""
-        if self._app is None:
-            raise RuntimeError("Excel application is not running. It may have been closed or not initialized.")
-        return self._app
+        """Get the Excel application instance, starting Excel if it is not running."""
+        app = self._app
+        if app is None:
+            app = self._start()
+        else:
+            ensure_com_initialized()
+        return app
+
+    def _ensure_alive(self):
+        """
+        Check the running Excel is still the one we started (same window handle), and start a
+        new one if it has gone away, e.g. closed by the user or crashed.  Workbooks open in the
+        old instance are lost either way.  Does nothing if Excel has not been started.
+        """
+        app = self._app
+        if app is None:
+            return
+        try:
+            alive = app.Hwnd == self._hwnd
+        except pywintypes.com_error:
+            alive = False
+        if not alive:
+            logger.warning("Excel application disconnected, starting a new instance")
+            self._app = None
+            self._start()
 
     @property
     def visible(self):
@@ -46,19 +181,72 @@ class _app_singleton:
         """Set visibility of Excel application."""
         self.app.Visible = value
     
-    def create_workbook(self, filepath=None):
+    @contextmanager
+    def bulk(self):
+        """
+        Context manager for bulk edits.  Turns off screen updating, events, the status bar,
+        automatic calculation and recalculation before saving while inside, and restores the
+        previous settings on exit.  Nested uses only change the settings at the outermost level.
+        Formulas show stale values until recalculated (Workbook.calculate_now()).
+        """
+        if self._bulk_depth:
+            self._bulk_depth += 1
+            try:
+                yield self
+            finally:
+                self._bulk_depth -= 1
+            return
+
+        app = self.app
+        saved = dict()
+        for attr, value in (("ScreenUpdating", False), ("EnableEvents", False),
+                            ("DisplayStatusBar", False), ("Calculation", XL_CALCULATION_MANUAL),
+                            ("CalculateBeforeSave", False)):
+            try:
+                saved[attr] = getattr(app, attr)
+                if saved[attr] != value:
+                    setattr(app, attr, value)
+            except Exception as e: # Calculation can't be set with no workbook open
+                logger.debug(f"Unable to set {attr} for bulk edit: {e}")
+                saved.pop(attr, None)
+
+        self._bulk_depth = 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth = 0
+            for attr, value in saved.items():
+                try:
+                    if getattr(app, attr) != value:
+                        setattr(app, attr, value)
+                except Exception as e:
+                    logger.error(f"Unable to restore {attr} after bulk edit: {e}")
+
+    def create_workbook(self, filepath=None, file_format=None):
+        self._ensure_alive()
         workbook = self.app.Workbooks.Add()
         if filepath:
-            workbook.SaveAs(os.path.abspath(filepath))
+            save_as(workbook, filepath, file_format)
             logger.info(f"Created new Excel file: {filepath}")
         return workbook
     
-    def open_workbook(self, filepath, read_only=False):
+    def open_workbook(self, filepath, read_only=False, update_links=0, password=None):
         """
-        Open an existing workbook.
+        Open an existing workbook.  External links are not updated by default (update_links=0),
+        and the read-only recommendation, notify and recent files list are skipped, so opening
+        does not stall on link refreshes or prompts.
         """
+        self._ensure_alive()
         abs_path = os.path.abspath(filepath)
-        workbook = self.app.Workbooks.Open(abs_path, ReadOnly=read_only)
+        open_args = dict(UpdateLinks=update_links, ReadOnly=read_only, IgnoreReadOnlyRecommended=True,
+                         Notify=False, AddToMru=False)
+        if password is not None:
+            open_args["Password"] = password
+        workbook = self.app.Workbooks.Open(abs_path, **open_args)
+        try: # only recalculate what is dirty, not the whole workbook, on every calculation
+            workbook.ForceFullCalculation = False
+        except Exception as e:
+            logger.debug(f"Unable to clear ForceFullCalculation: {e}")
         logger.info(f"Opened Excel file: {filepath}")
         return workbook
     
@@ -66,11 +254,39 @@ class _app_singleton:
         """
         Close a specific workbook.
         """
+        self._ensure_alive()
         try:
             workbook.Close(SaveChanges=save_changes)
         except Exception as e:
             logger.error(f"Error closing workbook: {e}")
     
+    def close_workbook_async(self, workbook, save_changes=True):
+        """
+        Close a workbook on a background thread, so the caller doesn't wait for the save.
+        Returns a Future; call result() on it to wait.  Closes run one at a time, in order,
+        and any still running are waited for at exit before Excel is quit.
+        """
+        oleobj = getattr(workbook, "_oleobj_", None)
+        if oleobj is None: # not an Excel workbook (e.g. openpyxl), nothing slow to hand off
+            self.close_workbook(workbook, save_changes)
+            future = Future()
+            future.set_result(None)
+            return future
+
+        # COM objects belong to the thread that made them, so hand the workbook over through a
+        # marshalled stream.  Excel is out of process, so the worker talks to it directly.
+        stream = pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, oleobj)
+        return self._close_executor().submit(_close_marshalled, stream, save_changes)
+
+    def _close_executor(self):
+        if _app_singleton._executor is None:
+            with self._app_lock:
+                if _app_singleton._executor is None:
+                    _app_singleton._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel-close")
+                    # registered after the quit hook, so it runs (and waits) before Excel is quit
+                    atexit.register(_app_singleton._executor.shutdown, wait=True)
+        return _app_singleton._executor
+
     def quit(self):
         """Quit the Excel application and clean up."""
         if self._app:
@@ -80,9 +296,30 @@ class _app_singleton:
                 logger.info("Excel application closed")
             except Exception as e:
                 logger.error(f"Error quitting Excel: {e}")
+        if getattr(_com_state, "owned", False): # only undo our own CoInitialize
+            pythoncom.CoUninitialize()
+            _com_state.owned = False
+            _com_state.initialized = False
+    
+    def release(self, force=False):
+        """
+        Quit Excel now instead of at exit, e.g. in a long running process that is done with
+        Excel for a while.  Refuses (returns False) while any workbooks are still open in it,
+        unless force is True.  Excel is started again on next use.
+        """
+        if self._app is None:
+            return True
+        count = self.workbook_count()
+        if count and not force:
+            logger.warning(f"Not releasing Excel: {count} workbook(s) still open")
+            return False
+        self.quit()
+        return True
     
     def workbook_count(self):
         """Get number of currently open workbooks."""
-        return self.app.Workbooks.Count
+        if self._app is None: # not running, so don't start it just to count nothing
+            return 0
+        return self._app.Workbooks.Count
 
 Application = _app_singleton()
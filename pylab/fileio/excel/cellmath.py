@@ -2,6 +2,9 @@
 Utilities for converting between Excel cell addresses and row/column indices.
 """
 
+import re
+import functools
+
 def validate_address(row, col):
     """
     Validate that row and column are positive integers.
@@ -18,74 +21,81 @@ def validate_address(row, col):
     if not isinstance(col, int) or col < 1:
         raise ValueError("Column must be a positive integer (1-indexed)")
 
+def _col_to_letter(col_num):
+    """Convert column number to Excel letter(s)."""
+    result = ""
+    while col_num > 0:
+        col_num -= 1
+        result = chr(col_num % 26 + ord('A')) + result
+        col_num //= 26
+    return result
+
+def _letter_to_col(letters):
+    """Convert Excel letter(s) to column number."""
+    col = 0
+    for char in letters.upper():
+        col = col * 26 + (ord(char) - ord('A') + 1)
+    return col
+
+# Excel has at most 16384 columns (A to XFD), so precompute the letters for all of them once
+MAX_COLUMNS = 16384
+_COL_LETTERS = ("",) + tuple(_col_to_letter(col) for col in range(1, MAX_COLUMNS + 1))
+_LETTER_TO_COL = {letters: col for col, letters in enumerate(_COL_LETTERS) if col}
+
+# Number of parsed addresses from_address keeps.  Big enough to hold a few thousand rows of a
+# logging loop's addresses, so a sweep that revisits them still hits.
+ADDRESS_CACHE_SIZE = 4096
+
+# a cell ('A1', '$A$1') or a range of two cells ('A1:C3'), matched in one go
+_ADDRESS_RE = re.compile(r"\$?([A-Za-z]+)\$?(\d+)(?::\$?([A-Za-z]+)\$?(\d+))?")
+
 def to_address(row, col, row2=None, col2=None):
     """Convert row/column indices to Excel address string."""
-    def col_to_letter(col_num):
-        """Convert column number to Excel letter(s)."""
-        result = ""
-        while col_num > 0:
-            col_num -= 1
-            result = chr(col_num % 26 + ord('A')) + result
-            col_num //= 26
-        return result
-    
-    start_cell = f"{col_to_letter(col)}{row}"
+    letters = _COL_LETTERS[col] if 0 < col <= MAX_COLUMNS else _col_to_letter(col)
+    start_cell = f"{letters}{row}"
     
     if row2 is not None and col2 is not None:
-        end_cell = f"{col_to_letter(col2)}{row2}"
-        return f"{start_cell}:{end_cell}"
+        letters2 = _COL_LETTERS[col2] if 0 < col2 <= MAX_COLUMNS else _col_to_letter(col2)
+        return f"{start_cell}:{letters2}{row2}"
     
     return start_cell
 
 
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
 def from_address(address):
-    """Convert Excel address string to row/column indices."""
-    def letter_to_col(letters):
-        """Convert Excel letter(s) to column number."""
-        col = 0
-        for char in letters.upper():
-            col = col * 26 + (ord(char) - ord('A') + 1)
-        return col
+    """
+    Convert Excel address string to row/column indices.  Results are cached, since loops
+    tend to parse the same few addresses over and over.
+    """
+    match = _ADDRESS_RE.fullmatch(address.strip())
+    if match is None:
+        raise ValueError(f"Invalid cell address: '{address}'")
+    letters, numbers, letters2, numbers2 = match.groups()
     
-    def parse_cell(cell):
-        """Parse single cell reference into row, col."""
-        letters = ""
-        numbers = ""
-        for char in cell:
-            if char.isalpha():
-                letters += char
-            elif char.isdigit():
-                numbers += char
-        
-        col = letter_to_col(letters)
-        row = int(numbers)
-        return row, col
+    col = _LETTER_TO_COL.get(letters.upper()) or _letter_to_col(letters)
+    if letters2 is None:
+        return int(numbers), col
     
-    # Check if it's a range
-    if ':' in address:
-        start, end = address.split(':')
-        row1, col1 = parse_cell(start)
-        row2, col2 = parse_cell(end)
-        return row1, col1, row2, col2
-    else:
-        return parse_cell(address)
+    # It's a range
+    col2 = _LETTER_TO_COL.get(letters2.upper()) or _letter_to_col(letters2)
+    return int(numbers), col, int(numbers2), col2
+
+
+def _increment(address, row_offset, col_offset):
+    """Offset an address (cell or range) by whole rows/columns, parsing and formatting once."""
+    parsed = from_address(address)
+    if len(parsed) == 4:
+        row1, col1, row2, col2 = parsed
+        return to_address(row1 + row_offset, col1 + col_offset, row2 + row_offset, col2 + col_offset)
+    row, col = parsed
+    return to_address(row + row_offset, col + col_offset)
 
 
 def increment_column(address, offset=1):
     """Increment the column in an Excel address."""
-    if ':' in address:
-        row1, col1, row2, col2 = from_address(address)
-        return to_address(row1, col1 + offset, row2, col2 + offset)
-    else:
-        row, col = from_address(address)
-        return to_address(row, col + offset)
+    return _increment(address, 0, offset)
 
 
 def increment_row(address, offset=1):
     """Increment the row in an Excel address."""
-    if ':' in address:
-        row1, col1, row2, col2 = from_address(address)
-        return to_address(row1 + offset, col1, row2 + offset, col2)
-    else:
-        row, col = from_address(address)
-        return to_address(row + offset, col)
\ No newline at end of file
+    return _increment(address, offset, 0)
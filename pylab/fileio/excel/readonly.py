@@ -0,0 +1,113 @@
+"""
+Read-only workbook access through openpyxl, without starting Excel.
+
+The classes here mimic the small part of the Excel COM object model that Workbook uses for
+reading (Worksheets, Cells, Range, UsedRange, Close), so Workbook can use either one the same
+way.  Reading the file directly is orders of magnitude faster than going through Excel for
+plain data pulls.
+
+Notes:
+- Formulas read as their last saved values (data_only), as Excel would show them.
+- Dates read as datetime objects for both Value and Value2.
+- openpyxl read-only sheets are streamed, so single cells are slow to look up; read whole
+  ranges where possible.
+"""
+
+import os
+
+import logging
+logger = logging.getLogger(__name__)
+
+from .cellmath import from_address, to_address
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+# file types openpyxl can read
+EXTENSIONS = (".xlsx", ".xlsm")
+
+def can_open(filepath):
+    """True if openpyxl is installed and can read this file."""
+    return openpyxl is not None and os.path.splitext(filepath)[1].lower() in EXTENSIONS
+
+class _Range:
+    def __init__(self, sheet, start_row, start_col, end_row, end_col):
+        self._sheet = sheet
+        self._bounds = (start_row, start_col, end_row, end_col)
+
+    @property
+    def Value(self):
+        start_row, start_col, end_row, end_col = self._bounds
+        values = tuple(self._sheet._ws.iter_rows(min_row=start_row, max_row=end_row, min_col=start_col,
+                                                 max_col=end_col, values_only=True))
+        if (start_row, start_col) == (end_row, end_col): # single cells are scalars, like COM
+            return values[0][0] if values else None
+        width = end_col - start_col + 1 # streamed rows can come back short, so pad them
+        return tuple(tuple(row) + (None,) * (width - len(row)) for row in values)
+
+    Value2 = Value
+
+    @property
+    def Address(self):
+        start_row, start_col, end_row, end_col = self._bounds
+        if (start_row, start_col) == (end_row, end_col):
+            return to_address(start_row, start_col)
+        return to_address(*self._bounds)
+
+class _Sheet:
+    def __init__(self, ws):
+        self._ws = ws
+
+    @property
+    def Name(self):
+        return self._ws.title
+
+    def Cells(self, row, col):
+        return _Range(self, row, col, row, col)
+
+    def Range(self, address):
+        parsed = from_address(address)
+        if len(parsed) == 2:
+            return _Range(self, *parsed, *parsed)
+        return _Range(self, *parsed)
+
+    @property
+    def UsedRange(self):
+        max_row, max_col = self._ws.max_row, self._ws.max_column
+        if not max_row or not max_col: # no stored dimensions, so find them
+            self._ws.reset_dimensions()
+            self._ws.calculate_dimension(force=True)
+            max_row, max_col = self._ws.max_row or 1, self._ws.max_column or 1
+        return _Range(self, self._ws.min_row or 1, self._ws.min_column or 1, max_row, max_col)
+
+class _Worksheets:
+    def __init__(self, wb):
+        self._wb = wb
+
+    def __call__(self, sheet):
+        if isinstance(sheet, int):
+            return _Sheet(self._wb.worksheets[sheet - 1])
+        for ws in self._wb.worksheets: # Excel names are case insensitive
+            if ws.title.lower() == sheet.lower():
+                return _Sheet(ws)
+        raise KeyError(f"No sheet named '{sheet}'")
+
+    def __iter__(self):
+        return (_Sheet(ws) for ws in self._wb.worksheets)
+
+    @property
+    def Count(self):
+        return len(self._wb.worksheets)
+
+class ReadOnlyWorkbook:
+    """An openpyxl workbook opened read-only, with the COM names Workbook expects."""
+
+    def __init__(self, filepath):
+        self._wb = openpyxl.load_workbook(os.path.abspath(filepath), read_only=True, data_only=True)
+        self.Worksheets = _Worksheets(self._wb)
+        logger.info(f"Opened Excel file with openpyxl (read only): {filepath}")
+
+    def Close(self, SaveChanges=False):
+        self._wb.close() # read-only workbooks hold the file open until closed
@@ -1,13 +1,131 @@
 import os
+import datetime
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future
+
+import pythoncom
+import pywintypes
+from win32com.client import VARIANT
 
 import logging
 logger = logging.getLogger(__name__)
 
-from .application import Application
-from .cellmath import from_address, to_address, increment_column, increment_row, validate_address
+from .application import Application, save_as, ensure_com_initialized, early_bound
+from .readonly import ReadOnlyWorkbook, can_open as _openpyxl_can_open
+from .cellmath import from_address, to_address, validate_address
+
+# Writes of more cells than this switch Excel to bulk mode (no repaint/recalc) for the write.
+# Toggling the settings costs several COM calls, so small writes are faster without it.
+BULK_THRESHOLD = 100
+
+# read_many() reads the rectangle around all the requested cells in one call when it has at
+# most this many cells, and falls back to one read per group of adjacent cells otherwise.
+READ_MANY_BOX_LIMIT = 10000
+
+# Writes of more cells than this are handed to COM already typed as a 2D SAFEARRAY of VARIANTs,
+# so pywin32 builds the array in one pass instead of working out the type of the nested tuples.
+SAFEARRAY_THRESHOLD = 10000
+
+# Most cells write_cell remembers the number format of, so rewriting a cell with the format it
+# already has skips the NumberFormat call.  The memory is dropped when it grows past this.
+FORMAT_MEMO_SIZE = 4096
+
+# Excel's serial date 0 (dates are days since this, as floats)
+_OADATE_EPOCH = datetime.datetime(1899, 12, 30)
+
+def from_oadate(value):
+    """
+    Convert an Excel serial date (as returned by Value2 reads) to a datetime.  Non-numeric
+    values are returned unchanged, so this can be mapped over a mixed row or column.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    return _OADATE_EPOCH + datetime.timedelta(days=value)
+
+def _to_cell_value(value):
+    """
+    Make a DataFrame value something COM can marshal: NumPy scalars to Python, NaN/NaT/NA to
+    empty, and datetimes (including datetime64 and Timestamp) to pywintypes.Time.
+    """
+    if isinstance(value, str):
+        return value
+    if type(value).__name__ == "datetime64": # .item() on these gives int nanoseconds
+        value = value.astype("datetime64[us]")
+    if hasattr(value, "item"): # NumPy scalars (int64 etc. are not Python ints)
+        value = value.item()
+    try:
+        if value != value: # NaN and NaT
+            return None
+    except TypeError: # pandas NA compares as NA, which has no truth value
+        return None
+    if isinstance(value, datetime.datetime):
+        return pywintypes.Time(value)
+    return value
+
+def _com_rows(rows, cell_count):
+    """Row tuples ready to assign to Range.Value; large blocks are wrapped as a typed SAFEARRAY."""
+    if cell_count > SAFEARRAY_THRESHOLD:
+        return VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_VARIANT, rows)
+    return rows
+
+def _as_rows(values):
+    """
+    Range values as a tuple of row tuples.  Multi-cell ranges already come back from Excel that
+    way and are returned as is, without copying; single cells (scalars) are wrapped.
+    """
+    if isinstance(values, tuple):
+        if values and not isinstance(values[0], tuple):
+            return (values,)
+        return values
+    return ((values,),)
+
+def _coalesce(cells):
+    """
+    Group a dict of (row, col) -> value into rectangles of adjacent cells.  Returns a list of
+    (first row, first col, last row, last col, tuple of row tuples) covering every cell.
+    """
+    runs = list() # (row, first col, [values]) for each run of adjacent cells in a row
+    for (row, col) in sorted(cells):
+        if runs and runs[-1][0] == row and runs[-1][1] + len(runs[-1][2]) == col:
+            runs[-1][2].append(cells[(row, col)])
+        else:
+            runs.append((row, col, [cells[(row, col)]]))
+    
+    rects = list() # (first col, width, [first row, last row, [row tuples]])
+    open_rects = dict() # (first col, width) -> rectangle that a run in the next row can extend
+    for row, col, values in runs:
+        rect = open_rects.get((col, len(values)))
+        if rect is not None and rect[1] == row - 1:
+            rect[1] = row
+            rect[2].append(tuple(values))
+        else:
+            rect = [row, row, [tuple(values)]]
+            open_rects[(col, len(values))] = rect
+            rects.append((col, len(values), rect))
+    
+    return [(first_row, col, last_row, col + width - 1, tuple(rows))
+            for col, width, (first_row, last_row, rows) in rects]
 
 class Workbook:
-    def __init__(self, filepath, increment_col=0, increment_row=0, open_now=False, read_only=False):
+    """
+    Reads use Value2 by default, which skips Excel's per-cell date and currency conversion.
+    Dates come back as serial day numbers (floats) and currency as plain floats; use
+    from_oadate() to convert dates, or pass as_value=True to get Excel typed values instead.
+
+    New files and save_as() pick the file format from the extension.  Large logs are best kept
+    as .xlsb: the binary format is several times smaller and faster to open and save than
+    .xlsx, at the cost of not being plain zipped XML for other tools to read.
+
+    Existing .xlsx/.xlsm files opened read only are read with openpyxl when it is installed,
+    without starting Excel at all (see readonly.py).  Pass use_openpyxl=False to always go
+    through Excel, e.g. to activate sheets or to get Value2 style serial dates.
+    """
+    __slots__ = ("filepath", "workbook", "increment_col", "increment_row", "_is_open", "_read_only",
+                 "_selected_sheet", "_selected_name", "_sheets_cache", "_file_format", "_use_openpyxl", "_batch",
+                 "_refcount", "_dirty", "_formats")
+
+    def __init__(self, filepath, increment_col=0, increment_row=0, open_now=False, read_only=False, file_format=None,
+                 use_openpyxl=True):
         self.filepath = filepath
         self.workbook = None
         self.increment_col = increment_col
@@ -16,6 +134,14 @@ class Workbook:
         self._is_open = False
         self._read_only = read_only
         self._selected_sheet = None
+        self._selected_name = None # name of the selected sheet, None until first asked for
+        self._sheets_cache = None # sheet name -> sheet object, built on first use
+        self._file_format = file_format
+        self._use_openpyxl = use_openpyxl
+        self._batch = None # (row, col) -> (value, format) while inside batch()
+        self._refcount = 0 # nested with blocks using this workbook
+        self._dirty = False # changed through this class since the last save
+        self._formats = None # (sheet, {(row, col): format}) set by write_cell, see _format_changed()
 
         if open_now:
             self.open(read_only=read_only)
@@ -27,35 +153,62 @@ class Workbook:
         
         self._read_only = read_only
         
-        if os.path.exists(self.filepath):
+        exists = os.path.exists(self.filepath) # stat the file once for all the branches
+        if exists and read_only and self._use_openpyxl and _openpyxl_can_open(self.filepath):
+            self.workbook = ReadOnlyWorkbook(self.filepath) # plain data read, no need for Excel
+        elif exists:
+            ensure_com_initialized()
             self.workbook = Application.open_workbook(self.filepath, read_only)
         else:
             if read_only:
                 raise FileNotFoundError(f"Cannot open non-existent file in read-only mode: {self.filepath}")
-            self.workbook = Application.create_workbook(self.filepath)
+            ensure_com_initialized()
+            self.workbook = Application.create_workbook(self.filepath, self._file_format)
         
         self._is_open = True
+        self._dirty = False
+        self._sheets_cache = None
         
         # Select first sheet by default
-        self._selected_sheet = self.workbook.Worksheets(1)
+        self._selected_sheet = early_bound(self.workbook.Worksheets(1), "_Worksheet")
+        self._selected_name = None
         
         return self.workbook
     
-    def save(self):
-        """Save the workbook."""
+    def save(self, force=False):
+        """
+        Save the workbook, if anything was changed through this class since the last save.
+        Saving writes the whole file, so calling this after every write in a loop only costs
+        a save when there is something new.  Pass force=True to save anyway, e.g. after
+        editing through the workbook COM object directly.
+        
+        Returns:
+            bool: True if the workbook was saved
+        """
         if not self._is_open or not self.workbook:
             raise RuntimeError("Workbook is not open")
         if self._read_only:
             raise PermissionError("Cannot save workbook opened in read-only mode")
+        self.flush()
+        if not (self._dirty or force):
+            return False
         self.workbook.Save()
+        self._dirty = False
+        return True
     
-    def save_as(self, new_filepath):
+    def save_as(self, new_filepath, file_format=None):
+        """
+        Save the workbook to a new file.  The format follows the extension unless file_format
+        (an Excel FileFormat number) is given.
+        """
         if not self._is_open or not self.workbook:
             raise RuntimeError("Workbook is not open")
         if self._read_only:
             raise PermissionError("Cannot save workbook opened in read-only mode")
-        self.workbook.SaveAs(os.path.abspath(new_filepath))
+        self.flush()
+        save_as(self.workbook, new_filepath, file_format)
         self.filepath = new_filepath
+        self._dirty = False
     
     def list_sheets(self):
         """
@@ -66,7 +219,19 @@ class Workbook:
         """
         if not self._is_open or not self.workbook:
             raise RuntimeError("Workbook is not open")
-        return [sheet.Name for sheet in self.workbook.Worksheets]
+        return list(self._sheets())
+    
+    def _sheets(self):
+        """
+        Sheet name -> sheet object for the open workbook, in workbook order.  Built once by
+        walking the Worksheets collection, then kept up to date as sheets are added, deleted or
+        renamed through this class (or dropped and rebuilt if that can't be done cheaply, or
+        Excel raised part way through).  Changes made directly in Excel are not seen.
+        """
+        if self._sheets_cache is None:
+            self._sheets_cache = {sheet.Name: sheet for sheet in
+                                  (early_bound(sheet, "_Worksheet") for sheet in self.workbook.Worksheets)}
+        return self._sheets_cache
     
     def add_sheet(self, name=None, before=None, after=None, select=True):
         """
@@ -85,34 +250,45 @@ class Workbook:
             raise RuntimeError("Workbook is not open")
         if self._read_only:
             raise PermissionError("Cannot add sheet to workbook opened in read-only mode")
-        
-        # Determine position
-        if before is not None:
-            if isinstance(before, str):
-                before_sheet = self.workbook.Worksheets(before)
-            else:
-                before_sheet = self.workbook.Worksheets(before)
-            new_sheet = self.workbook.Worksheets.Add(Before=before_sheet)
-        elif after is not None:
-            if isinstance(after, str):
-                after_sheet = self.workbook.Worksheets(after)
+        self.flush() # queued writes belong to the current sheet
+        
+        # Check the name before adding, so a clash doesn't leave an extra sheet behind
+        if name is not None and self._cached_sheet(name) is not None:
+            raise ValueError(f"Sheet with name '{name}' already exists")
+        
+        self._dirty = True
+        try:
+            # Determine position
+            ws = self.workbook.Worksheets # each '.' is a COM call, so fetch the collection once
+            if before is not None:
+                new_sheet = ws.Add(Before=self._get_sheet(before, ws))
+            elif after is not None:
+                new_sheet = ws.Add(After=self._get_sheet(after, ws))
             else:
-                after_sheet = self.workbook.Worksheets(after)
-            new_sheet = self.workbook.Worksheets.Add(After=after_sheet)
+                # Add at the end
+                new_sheet = ws.Add(After=ws(ws.Count))
+            new_sheet = early_bound(new_sheet, "_Worksheet")
+            
+            # Set name if provided
+            if name is not None:
+                new_sheet.Name = name
+            new_name = new_sheet.Name
+        except Exception:
+            self._sheets_cache = None # no telling what state Excel was left in
+            raise
+        
+        # keep the sheet map in order without walking Worksheets again.  Sheets added in the
+        # middle would need reordering, so just drop the map for those.
+        if self._sheets_cache is not None and before is None and after is None:
+            self._sheets_cache[new_name] = new_sheet
         else:
-            # Add at the end
-            new_sheet = self.workbook.Worksheets.Add(After=self.workbook.Worksheets(self.workbook.Worksheets.Count))
-        
-        # Set name if provided
-        if name is not None:
-            if name in self.list_sheets():
-                raise ValueError(f"Sheet with name '{name}' already exists")
-            new_sheet.Name = name
+            self._sheets_cache = None
         
         if select:
-            self.sheet = new_sheet.Name
+            self._selected_sheet = new_sheet
+            self._selected_name = new_name
 
-        return new_sheet.Name
+        return new_name
     
     def delete_sheet(self, sheet):
         """
@@ -125,22 +301,27 @@ class Workbook:
             raise RuntimeError("Workbook is not open")
         if self._read_only:
             raise PermissionError("Cannot delete sheet from workbook opened in read-only mode")
+        self.flush()
         
-        if self.workbook.Worksheets.Count == 1:
+        ws = self.workbook.Worksheets
+        if ws.Count == 1:
             raise ValueError("Cannot delete the last sheet in the workbook")
         
-        if isinstance(sheet, str):
-            sheet_obj = self.workbook.Worksheets(sheet)
-        elif isinstance(sheet, int):
-            sheet_obj = self.workbook.Worksheets(sheet)
-        else:
-            raise TypeError("Sheet must be a string (name) or integer (index)")
+        sheet_obj, sheet_name = self._live_sheet(sheet, ws)
         
         # Clear selected sheet if we're deleting it
-        if self._selected_sheet is not None and self._selected_sheet.Name == sheet_obj.Name:
+        if self._selected_sheet is not None and self.sheet == sheet_name:
             self._selected_sheet = None
-        
-        sheet_obj.Delete()
+            self._selected_name = None
+        
+        try:
+            sheet_obj.Delete()
+        except Exception:
+            self._sheets_cache = None
+            raise
+        self._dirty = True
+        if self._sheets_cache is not None:
+            self._sheets_cache.pop(sheet_name, None)
     
     def rename_sheet(self, old_name, new_name):
         """
@@ -155,17 +336,21 @@ class Workbook:
         if self._read_only:
             raise PermissionError("Cannot rename sheet in workbook opened in read-only mode")
         
-        if new_name in self.list_sheets():
+        sheet_obj, current_name = self._live_sheet(old_name)
+        # Excel names ignore case, so a clash is any other sheet with the name in any case
+        if current_name.lower() != new_name.lower() and self._cached_sheet(new_name) is not None:
             raise ValueError(f"Sheet with name '{new_name}' already exists")
         
-        if isinstance(old_name, str):
-            sheet_obj = self.workbook.Worksheets(old_name)
-        elif isinstance(old_name, int):
-            sheet_obj = self.workbook.Worksheets(old_name)
-        else:
-            raise TypeError("Old name must be a string (name) or integer (index)")
-        
-        sheet_obj.Name = new_name
+        try:
+            sheet_obj.Name = new_name
+        except Exception:
+            self._sheets_cache = None
+            raise
+        self._dirty = True
+        if self._sheets_cache is not None: # rename in place, keeping sheet order
+            self._sheets_cache = {(new_name if n == current_name else n): sheet for n, sheet in self._sheets_cache.items()}
+        if self._selected_name == current_name:
+            self._selected_name = new_name
     
     def activate_sheet(self, sheet):
         """
@@ -179,23 +364,18 @@ class Workbook:
         """
         if not self._is_open or not self.workbook:
             raise RuntimeError("Workbook is not open")
+        if isinstance(self.workbook, ReadOnlyWorkbook):
+            logger.error("Cannot activate sheet: workbook was opened with openpyxl, not in Excel")
+            return False
         
         # Check if Excel is visible
-        excel_app = Application._app
+        excel_app = Application.app
         if not excel_app.Visible:
             logger.error("Cannot activate sheet: Excel application is not visible")
             return False
         
-        # Get the sheet
-        if isinstance(sheet, str):
-            sheet_obj = self.workbook.Worksheets(sheet)
-        elif isinstance(sheet, int):
-            sheet_obj = self.workbook.Worksheets(sheet)
-        else:
-            raise TypeError("Sheet must be a string (name) or integer (index)")
-        
         # Activate the sheet
-        sheet_obj.Activate()
+        self._get_sheet(sheet).Activate()
         return True
     
     @property
@@ -203,7 +383,9 @@ class Workbook:
         """Get the name of the currently selected sheet."""
         if self._selected_sheet is None:
             return None
-        return self._selected_sheet.Name
+        if self._selected_name is None: # fetched once per selection, not on every call
+            self._selected_name = self._selected_sheet.Name
+        return self._selected_name
     
     @sheet.setter
     def sheet(self, sheet):
@@ -216,12 +398,69 @@ class Workbook:
         if not self._is_open or not self.workbook:
             raise RuntimeError("Workbook is not open")
         
+        self.flush() # queued writes belong to the current sheet
+        self._selected_sheet = self._get_sheet(sheet)
+        self._selected_name = None
+    
+    def _get_sheet(self, sheet, ws=None):
+        """
+        Sheet object by name (str) or index (int, 1-indexed).  Names come from the cached sheet
+        map when possible; ws is the Worksheets collection if the caller already has it.
+        """
         if isinstance(sheet, str):
-            self._selected_sheet = self.workbook.Worksheets(sheet)
-        elif isinstance(sheet, int):
-            self._selected_sheet = self.workbook.Worksheets(sheet)
-        else:
-            raise TypeError("Sheet must be a string (name) or integer (index)")
+            sheet_obj = self._cached_sheet(sheet)
+            if sheet_obj is not None:
+                return sheet_obj
+        if ws is None:
+            ws = self.workbook.Worksheets
+        try: # Worksheets() takes names and indices itself, so only check the type on failure
+            sheet_obj = early_bound(ws(sheet), "_Worksheet")
+        except Exception:
+            if not isinstance(sheet, (str, int)):
+                raise TypeError("Sheet must be a string (name) or integer (index)") from None
+            raise
+        if isinstance(sheet, str): # Excel has a sheet the map doesn't, so the map is out of date
+            self._sheets_cache = None
+        return sheet_obj
+    
+    def _cached_sheet(self, name):
+        """Sheet object from the sheet map by name, ignoring case as Excel does, or None."""
+        sheets = self._sheets()
+        sheet_obj = sheets.get(name)
+        if sheet_obj is not None:
+            return sheet_obj
+        lowered = name.lower()
+        for sheet_name, sheet_obj in sheets.items():
+            if sheet_name.lower() == lowered:
+                return sheet_obj
+        return None
+    
+    def _live_sheet(self, sheet, ws=None):
+        """
+        _get_sheet() plus the sheet's name, for callers that need it anyway.  Fetching the name
+        is the first COM call through the handle, so a cached handle to a sheet deleted in Excel
+        fails here; drop the sheet map and look the sheet up again once.
+        """
+        sheet_obj = self._get_sheet(sheet, ws)
+        try:
+            return sheet_obj, sheet_obj.Name
+        except pywintypes.com_error:
+            self._sheets_cache = None
+            sheet_obj = self._get_sheet(sheet, ws)
+            return sheet_obj, sheet_obj.Name
+    
+    def _raise_state(self, write=False):
+        """
+        Raise the error for a read or write that can't go ahead.  Hot paths only check
+        _selected_sheet (never set while closed) and _read_only, and call this when either
+        fails, so the detailed checks are off the fast path.
+        """
+        if not self._is_open or not self.workbook:
+            raise RuntimeError("Workbook is not open")
+        if self._selected_sheet is None:
+            raise RuntimeError("No sheet selected")
+        if write and self._read_only:
+            raise PermissionError("Cannot write to workbook opened in read-only mode")
     
     def _parse_cell_address(self, address):
         """Normalize a single-cell address into (row, col)."""
@@ -257,66 +496,98 @@ class Workbook:
             return start_row, start_col, end_row, end_col
         raise TypeError("Range must be a string or ((r1, c1), (r2, c2)) tuple")
     
-    def read(self, address):
+    def read(self, address, as_value=False):
         """
         Read a value from a cell.
         
         Args:
             address: Excel address string (e.g., "A1") or (row, col) tuple
+            as_value: If True, read Value (dates/currency converted) instead of Value2
         
         Returns:
             Cell value
         """
-        if not self._is_open or not self.workbook:
-            raise RuntimeError("Workbook is not open")
-        if self._selected_sheet is None:
-            raise RuntimeError("No sheet selected")
+        sheet = self._selected_sheet # bound once, it's used again below
+        if sheet is None:
+            self._raise_state()
         
+        self.flush()
         row, col = self._parse_cell_address(address)
-        return self._selected_sheet.Cells(row, col).Value
+        if isinstance(address, str): # checked above, so hand it to Excel as is instead of re-formatting
+            cell = sheet.Range(address)
+        else:
+            cell = sheet.Range(to_address(row, col))
+        return cell.Value if as_value else cell.Value2
     
-    def read_range(self, range_address):
+    def read_range(self, range_address, as_value=False):
         """
         Read a range of cells.
         
         Args:
             range_address: Excel range address string (e.g., "A1:C3") or ((r1, c1), (r2, c2)) tuple
+            as_value: If True, read Value (dates/currency converted) instead of Value2
         
         Returns:
-            tuple: (values, next_address) where values is a 2D list and next_address is the incremented address
+            tuple: (values, next_address) where values is a tuple of row tuples, as Excel returns
+                them (not copied into lists), and next_address is the incremented address
         """
-        if not self._is_open or not self.workbook:
-            raise RuntimeError("Workbook is not open")
-        if self._selected_sheet is None:
-            raise RuntimeError("No sheet selected")
+        sheet = self._selected_sheet
+        if sheet is None:
+            self._raise_state()
         
         start_row, start_col, end_row, end_col = self._parse_range_address(range_address)
         
-        range_obj = self._selected_sheet.Range(
-            self._selected_sheet.Cells(start_row, start_col),
-            self._selected_sheet.Cells(end_row, end_col)
-        )
-        
-        values = range_obj.Value
-        
-        if values is None:
-            result_values = [[None]]
-        elif isinstance(values, tuple):
-            if len(values) > 0 and isinstance(values[0], tuple):
-                result_values = [list(row) for row in values]
-            else:
-                result_values = [list(values)]
+        self.flush()
+        if isinstance(range_address, str):
+            range_obj = sheet.Range(range_address)
         else:
-            result_values = [[values]]
+            range_obj = sheet.Range(to_address(start_row, start_col, end_row, end_col))
+        result_values = _as_rows(range_obj.Value if as_value else range_obj.Value2)
         
-        result_address = to_address(start_row, start_col, end_row, end_col)
-        if self.increment_col != 0:
-            result_address = increment_column(result_address, self.increment_col)
-        if self.increment_row != 0:
-            result_address = increment_row(result_address, self.increment_row)
+        result_address = to_address(start_row + self.increment_row, start_col + self.increment_col,
+                                    end_row + self.increment_row, end_col + self.increment_col)
         
         return result_values, result_address
     
+    def read_many(self, addresses, as_value=False):
+        """
+        Read many scattered cells with as few COM calls as possible, instead of a read() each.
+        Multi-area (Union) ranges only return their first area's values, so the cells are read
+        as the one rectangle around them all when that is small enough (READ_MANY_BOX_LIMIT),
+        otherwise as one rectangle per group of adjacent cells.
+        
+        Args:
+            addresses: Iterable of Excel address strings (e.g., "A1") or (row, col) tuples
+            as_value: If True, read Value (dates/currency converted) instead of Value2
+        
+        Returns:
+            list: Cell values in the same order as addresses
+        """
+        if self._selected_sheet is None:
+            self._raise_state()
+        
+        cells = [self._parse_cell_address(address) for address in addresses]
+        if not cells:
+            return []
+        self.flush()
+        
+        rows = [row for row, _ in cells]
+        cols = [col for _, col in cells]
+        top, left, bottom, right = min(rows), min(cols), max(rows), max(cols)
+        if (bottom - top + 1) * (right - left + 1) <= READ_MANY_BOX_LIMIT:
+            range_obj = self._range(top, left, bottom, right)
+            box = _as_rows(range_obj.Value if as_value else range_obj.Value2)
+            return [box[row - top][col - left] for row, col in cells]
+        
+        values = dict()
+        for first_row, first_col, last_row, last_col, _ in _coalesce(dict.fromkeys(cells)):
+            range_obj = self._range(first_row, first_col, last_row, last_col)
+            block = _as_rows(range_obj.Value if as_value else range_obj.Value2)
+            for i, block_row in enumerate(block):
+                for j, value in enumerate(block_row):
+                    values[(first_row + i, first_col + j)] = value
+        return [values[cell] for cell in cells]
+    
     def write(self, address, value=None, format=None):
         """
         Write a value to a cell.
@@ -329,27 +600,63 @@ class Workbook:
         Returns:
             str: The incremented Excel address after applying increment_row and increment_col
         """
-        if not self._is_open or not self.workbook:
-            raise RuntimeError("Workbook is not open")
-        if self._selected_sheet is None:
-            raise RuntimeError("No sheet selected")
-        if self._read_only:
-            raise PermissionError("Cannot write to workbook opened in read-only mode")
+        if isinstance(address, str):
+            return self.write_addr(address, value, format)
+        if isinstance(address, tuple) and len(address) == 2:
+            return self.write_cell(address[0], address[1], value, format)
+        raise TypeError("Address must be a string or a (row, col) tuple")
+    
+    def write_cell(self, row, col, value=None, format=None):
+        """
+        Write a value to a cell by row and column (1-indexed).  Same as write() without working
+        out what kind of address was given, for tight loops.
         
-        row_num, col_num = self._parse_cell_address(address)
+        Returns:
+            str: The incremented Excel address after applying increment_row and increment_col
+        """
+        sheet = self._selected_sheet
+        if sheet is None or self._read_only:
+            self._raise_state(write=True)
+        validate_address(row, col)
         
-        cell = self._selected_sheet.Cells(row_num, col_num)
+        if self._batch is not None:
+            self._batch[(row, col)] = (value, format)
+            return to_address(row + self.increment_row, col + self.increment_col)
+        
+        cell = sheet.Range(to_address(row, col))
+        self._dirty = True
         cell.Value = value
-        if format is not None:
+        if format is not None and self._format_changed(row, col, format):
             cell.NumberFormat = format
-        result_address = to_address(row_num, col_num)
-        
-        if self.increment_col != 0:
-            result_address = increment_column(result_address, self.increment_col)
-        if self.increment_row != 0:
-            result_address = increment_row(result_address, self.increment_row)
+        return to_address(row + self.increment_row, col + self.increment_col)
+    
+    def _format_changed(self, row, col, format):
+        """
+        True if write_cell needs to set this cell's number format, i.e. it did not already set
+        the same format on it.  Remembers format for the cell.  The memory only covers the
+        selected sheet, and range format writes clear it; formats changed directly in Excel
+        are not seen.
+        """
+        memo = self._formats
+        if memo is None or memo[0] is not self._selected_sheet or len(memo[1]) >= FORMAT_MEMO_SIZE:
+            memo = self._formats = (self._selected_sheet, dict())
+        if memo[1].get((row, col)) == format:
+            return False
+        memo[1][(row, col)] = format
+        return True
+    
+    def write_addr(self, address, value=None, format=None):
+        """
+        Write a value to a cell by address string (e.g., "A1").  Same as write() for string
+        addresses.
         
-        return result_address
+        Returns:
+            str: The incremented Excel address after applying increment_row and increment_col
+        """
+        parsed = from_address(address)
+        if len(parsed) != 2:
+            raise ValueError("Address must reference a single cell like 'A1'")
+        return self.write_cell(parsed[0], parsed[1], value, format)
     
     def write_range(self, range_address, values, format=None):
         """
@@ -357,50 +664,304 @@ class Workbook:
         
         Args:
             range_address: Excel range address string (e.g., "A1:C3") or ((r1, c1), (r2, c2)) tuple
-            values: 2D list of values to write
+            values: 2D list of values to write.  A tuple of row tuples (e.g. from read_range) is
+                passed to Excel as is, with no conversion, which is the fastest way to write
+                the same shape over and over.  NumPy arrays (anything with tolist()) are
+                converted in one C call.
             format: Optional format string to apply to all cells in range
         
         Returns:
             str: The range address that was written to
         """
-        if not self._is_open or not self.workbook:
-            raise RuntimeError("Workbook is not open")
-        if self._selected_sheet is None:
-            raise RuntimeError("No sheet selected")
-        if self._read_only:
-            raise PermissionError("Cannot write to workbook opened in read-only mode")
+        sheet = self._selected_sheet
+        if sheet is None or self._read_only:
+            self._raise_state(write=True)
         
         start_row_num, start_col_num, end_row_num, end_col_num = self._parse_range_address(range_address)
         
-        if not isinstance(values, list):
-            raise ValueError("Values must be a 2D list")
+        if hasattr(values, "tolist") and not isinstance(values, (list, tuple)):
+            values = values.tolist() # NumPy arrays: nested lists of plain Python values, in C
         
-        if len(values) > 0 and not isinstance(values[0], list):
+        if isinstance(values, tuple):
+            if not set(map(type, values)) <= {tuple}:
+                raise ValueError("Values must be a 2D list or a tuple of row tuples")
+        elif not isinstance(values, list):
+            raise ValueError("Values must be a 2D list")
+        elif len(values) > 0 and not isinstance(values[0], list):
             values = [values]
         
-        range_obj = self._selected_sheet.Range(
-            self._selected_sheet.Cells(start_row_num, start_col_num),
-            self._selected_sheet.Cells(end_row_num, end_col_num)
-        )
+        self.flush() # keep write order with any queued single cell writes
+        address = to_address(start_row_num, start_col_num, end_row_num, end_col_num)
+        range_obj = sheet.Range(address) # one COM call, and the address is the return value too
+        
+        if isinstance(values, tuple): # already what COM wants
+            values_tuple = values
+        elif set(map(type, values)) <= {list}: # every row a list, so convert in C with no per-row checks
+            values_tuple = tuple(map(tuple, values))
+        else:
+            values_tuple = tuple(tuple(row) if isinstance(row, list) else (row,) for row in values)
+        cell_count = len(values_tuple) * len(values_tuple[0]) if values_tuple else 0
+        self._dirty = True
+        with self._bulk_if_large(cell_count):
+            range_obj.Value = _com_rows(values_tuple, cell_count)
+            if format is not None:
+                range_obj.NumberFormat = format
+                self._formats = None
+        
+        return address
+    
+    def write_many(self, items, format=None):
+        """
+        Write many single cells at once.  Cells are grouped into rectangles of adjacent cells,
+        and each rectangle is written with one range assignment instead of one COM call per cell.
+        
+        Args:
+            items: Dict of address -> value, or iterable of (address, value) pairs, address as
+                for write().  If an address appears more than once the last value wins.
+            format: Optional format string to apply to all written cells
+        
+        Returns:
+            int: Number of range writes issued
+        """
+        if self._selected_sheet is None or self._read_only:
+            self._raise_state(write=True)
+        
+        if isinstance(items, dict):
+            items = items.items()
+        cells = dict()
+        for address, value in items:
+            cells[self._parse_cell_address(address)] = value
+        self.flush() # queued writes to the same cells must not land after these
+        return self._write_cells(cells, format)
+    
+    def _write_cells(self, cells, format=None):
+        """
+        Write a dict of (row, col) -> value to the selected sheet, coalescing adjacent cells
+        into as few rectangular range writes as possible.  Returns the number of writes.
+        """
+        rects = _coalesce(cells)
+        self._dirty = True
+        with self._bulk_if_large(len(cells)):
+            for first_row, first_col, last_row, last_col, rows in rects:
+                range_obj = self._range(first_row, first_col, last_row, last_col)
+                range_obj.Value = rows
+                if format is not None:
+                    range_obj.NumberFormat = format
+                    self._formats = None
+        
+        return len(rects)
+    
+    def set_format(self, range_address, format):
+        """
+        Set the number format of a whole range with one COM call, rather than passing format
+        to a write per cell.
+        
+        Args:
+            range_address: Excel range address string (e.g., "A1:C3") or ((r1, c1), (r2, c2)) tuple
+            format: Format string (e.g., "0.00", "#,##0", "mm/dd/yyyy")
+        """
+        if self._selected_sheet is None or self._read_only:
+            self._raise_state(write=True)
+        self.flush()
+        self._dirty = True
+        self._range(*self._parse_range_address(range_address)).NumberFormat = format
+        self._formats = None
+    
+    @contextmanager
+    def batch(self, bulk=False):
+        """
+        Context manager that queues single cell writes (write, write_cell, write_addr) instead of
+        sending each one to Excel, then writes them all on exit with as few range writes as
+        possible (see flush()).  Reads inside the block flush first, so they see queued writes.
+        
+        Flushes of more than BULK_THRESHOLD cells already run in bulk mode.  Pass bulk=True to
+        keep the whole block in bulk mode (see bulk()), for loops that mix reads and writes
+        and so flush often in small pieces; formulas then read stale until calculate_now().
+        
+        Example:
+            with wb.batch():
+                for i, v in enumerate(values, start=1):
+                    wb.write_cell(i, 1, v)
+        """
+        with self.bulk() if bulk else nullcontext():
+            if self._batch is not None: # already batching, the outer block flushes
+                yield self
+                return
+            self._batch = dict()
+            try:
+                yield self
+            finally:
+                try:
+                    self.flush()
+                finally:
+                    self._batch = None
+    
+    def flush(self):
+        """
+        Write any queued batch writes now.  Returns the number of range writes issued.
+        """
+        if not self._batch:
+            return 0
+        pending, self._batch = self._batch, dict()
+        count = self._write_cells({cell: value for cell, (value, _) in pending.items()})
+        
+        # formats are applied separately, so mixed formats don't split up the value writes,
+        # and each format costs one call per rectangle of cells sharing it, not one per cell
+        by_format = dict() # format -> {(row, col): None}
+        for cell, (_, format) in pending.items():
+            if format is not None:
+                by_format.setdefault(format, dict())[cell] = None
+        with self._bulk_if_large(len(pending) if by_format else 0):
+            for format, cells in by_format.items():
+                for first_row, first_col, last_row, last_col, _ in _coalesce(cells):
+                    self._range(first_row, first_col, last_row, last_col).NumberFormat = format
+                    count += 1
+                self._formats = None
+        return count
+    
+    def write_dataframe(self, df, top_left, include_header=True, include_index=False, format=None):
+        """
+        Write a pandas DataFrame as one block, with a single range assignment instead of a
+        write() per cell.
+        
+        Args:
+            df: DataFrame to write (anything with columns, index and itertuples works)
+            top_left: Excel address string (e.g., "A1") or (row, col) tuple of the top left cell
+            include_header: If True, write the column names as the first row
+            include_index: If True, write the index as the first column
+            format: Optional format string to apply to all written cells
+        
+        Returns:
+            str: The range address that was written to
+        """
+        if self._selected_sheet is None or self._read_only:
+            self._raise_state(write=True)
+        
+        start_row, start_col = self._parse_cell_address(top_left)
+        
+        rows = list()
+        if include_header:
+            header = [str(c) for c in df.columns]
+            if include_index:
+                header.insert(0, "" if df.index.name is None else str(df.index.name))
+            rows.append(tuple(header))
+        rows.extend(tuple(map(_to_cell_value, row)) for row in df.itertuples(index=include_index, name=None))
+        if not rows or not rows[0]:
+            return None
         
-        values_tuple = tuple(tuple(row) if isinstance(row, list) else (row,) for row in values)
-        range_obj.Value = values_tuple
+        end_row = start_row + len(rows) - 1
+        end_col = start_col + len(rows[0]) - 1
+        self.flush()
+        address = to_address(start_row, start_col, end_row, end_col)
+        range_obj = self._selected_sheet.Range(address)
+        cell_count = len(rows) * len(rows[0])
+        self._dirty = True
+        with self._bulk_if_large(cell_count):
+            range_obj.Value = _com_rows(tuple(rows), cell_count)
+            if format is not None:
+                range_obj.NumberFormat = format
+                self._formats = None
+        
+        return address
+    
+    def read_used_range(self, as_value=False):
+        """
+        Read the whole used range of the selected sheet in a single call.  Index the result in
+        Python rather than calling read() per cell.
         
-        if format is not None:
-            range_obj.NumberFormat = format
+        Args:
+            as_value: If True, read Value (dates/currency converted) instead of Value2
         
-        return to_address(start_row_num, start_col_num, end_row_num, end_col_num)
+        Returns:
+            tuple: (values, address) where values is a tuple of row tuples and address is the used range
+        """
+        if self._selected_sheet is None:
+            self._raise_state()
+        
+        self.flush()
+        used = self._selected_sheet.UsedRange
+        result_values = _as_rows(used.Value if as_value else used.Value2)
+        return result_values, used.Address.replace("$", "")
+    
+    def _range(self, start_row, start_col, end_row, end_col):
+        """
+        Get a range object from its corner indices with a single COM call.  Range('A1') is one
+        call, where Cells(row, col) is two (fetch the Cells range, then index into it).
+        """
+        if start_row == end_row and start_col == end_col:
+            return self._selected_sheet.Range(to_address(start_row, start_col))
+        return self._selected_sheet.Range(to_address(start_row, start_col, end_row, end_col))
+    
+    def calculate_now(self):
+        """
+        Recalculate the workbook.  Use after edits made inside bulk(), where calculation is
+        manual and nothing is recalculated before saving.
+        """
+        if not self._is_open or not self.workbook:
+            raise RuntimeError("Workbook is not open")
+        if isinstance(self.workbook, ReadOnlyWorkbook):
+            return
+        for sheet in self._sheets().values():
+            sheet.Calculate()
+    
+    def bulk(self):
+        """
+        Context manager that turns off screen updating, events and automatic calculation for a
+        block of edits, e.g. a whole logging loop.  See Application.bulk().
+        """
+        return Application.bulk()
+    
+    def _bulk_if_large(self, cell_count):
+        """bulk() for writes over BULK_THRESHOLD cells, otherwise a no-op context."""
+        return Application.bulk() if cell_count > BULK_THRESHOLD else nullcontext()
     
     def close(self, save_changes=True):
         if not self._is_open:
             return
         
         if self.workbook:
+            if save_changes:
+                self.flush()
+            self._batch = None
             Application.close_workbook(self.workbook, save_changes)
             self.workbook = None
+        self._sheets_cache = None
+        self._selected_sheet = None
+        self._selected_name = None
         
         self._is_open = False
     
+    def close_async(self, save_changes=True):
+        """
+        Close the workbook without waiting for Excel to save and close it.  The workbook object
+        is closed straight away as far as this class is concerned; the save and close happen on
+        a background thread.
+        
+        Returns:
+            Future: resolves when the close has finished (call result() to wait or see errors)
+        """
+        if not self._is_open:
+            future = Future()
+            future.set_result(None)
+            return future
+        
+        future = None
+        if self.workbook:
+            if save_changes:
+                self.flush()
+            self._batch = None
+            future = Application.close_workbook_async(self.workbook, save_changes)
+            self.workbook = None
+        self._sheets_cache = None
+        self._selected_sheet = None
+        self._selected_name = None
+        
+        self._is_open = False
+        if future is None:
+            future = Future()
+            future.set_result(None)
+        return future
+    
     @property
     def is_open(self):
         """Check if workbook is currently open."""
@@ -411,11 +972,29 @@ class Workbook:
         """Check if workbook was opened in read-only mode."""
         return self._read_only
     
-    # Context manager methods
+    def __getstate__(self):
+        """
+        Pickle (and copy/deepcopy) only the settings, not the COM workbook.  Copies start out
+        closed; call open() on them to use them.
+        """
+        return dict(filepath=self.filepath, increment_col=self.increment_col, increment_row=self.increment_row,
+                    read_only=self._read_only, file_format=self._file_format, use_openpyxl=self._use_openpyxl)
+    
+    def __setstate__(self, state):
+        self.__init__(**state)
+    
+    # Context manager methods.  Nested with blocks share the open workbook; only the
+    # outermost one opens it (if needed) and closes it.
     def __enter__(self):
-        return self.open()
+        if self._refcount == 0 and not self._is_open:
+            self.open(read_only=self._read_only)
+        self._refcount += 1
+        return self.workbook
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._refcount -= 1
+        if self._refcount > 0:
+            return
         # Save unless there was an exception
         save = exc_type is None
         self.close(save_changes=save)
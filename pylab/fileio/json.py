@@ -1,24 +1,38 @@
 from pathlib import Path
 from ..utilities import load_data_file
 
+# (schema data, validator built from it); rebuilt when load_data_file returns a new schema
+_VALIDATOR = None
+
+def _schema_validator():
+    """
+    Validator for the SCPI schema, built once and reused.  Building one checks the schema and
+    resolves its references, which costs far more than validating a single file.
+    """
+    global _VALIDATOR
+    schema = load_data_file("SCPI_Schema")
+    if _VALIDATOR is None or _VALIDATOR[0] is not schema:
+        validator_cls = jsonschema.validators.validator_for(schema)
+        validator_cls.check_schema(schema)
+        _VALIDATOR = (schema, validator_cls(schema))
+    return _VALIDATOR[1]
+
 def validate_scpi_command_file(path: str | Path) -> tuple[bool, list[str]]:
     """
     Validate a SCPI command-set JSON file against pylab/data/SCPI_Schema.json.
     Returns (True, []) when valid, otherwise (False, [error messages]).
 
     Inputs:
-    - path: Path to the SCPI command-set JSON file to validate, or name 
+    - path: Path to the SCPI command-set JSON file to validate, or name
     of a data file in pylab/data/ to load.
     """
-    schema = load_data_file("SCPI_Schema")
+    validator = _schema_validator()
 
     errors: list[str] = []
     target = Path(path)
     try:
         data = load_data_file(target.name if target.name else str(target))
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as ve:
-        errors.append(f"{target}: {ve.message}")
+        errors.extend(f"{target}: {ve.message}" for ve in validator.iter_errors(data))
     except Exception as e:
         errors.append(f"{target}: failed to load/parse ({e})")
 
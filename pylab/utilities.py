@@ -2,11 +2,17 @@
 Helper functions to tie it all together
 """
 
+import fnmatch
 import json
 import os
 import pathlib
 import logging
 
+try: # optional, several times faster to parse than the json module
+    import orjson
+except ImportError:
+    orjson = None
+
 DATA_REL_PATH = r"data"
 DATA_ABS_PATH = None
 
@@ -14,23 +20,39 @@ if DATA_ABS_PATH is None:
     fpath, fname = os.path.split(__file__)
     DATA_ABS_PATH = pathlib.Path(fpath, DATA_REL_PATH)
 
+# resolved data file path -> (modification time in ns, parsed data)
+_DATA_CACHE = dict()
+
+def _data_file_path(fname):
+    """Find a data file by name, with or without its .json suffix."""
+    base_path = pathlib.Path(DATA_ABS_PATH, fname)  # type: ignore
+    candidates = (base_path, pathlib.Path(f"{base_path}.json"))
+
+    full_path = next((path for path in candidates if path.is_file()), None)
+    if full_path is None:
+        raise FileNotFoundError(f"Data file '{fname}' not found in {DATA_ABS_PATH}")
+    return full_path
+
 def load_data_file(fname):
     """
     Load a data file from the data directory.
 
+    Parsed files are cached until the file changes on disk, and every caller gets the same
+    object back, so copy the data before modifying it.
+
     :param fname: filename to load. not including suffix or path.
     :return: data loaded from file as dict
     """
+    full_path = _data_file_path(fname)
+    mtime = full_path.stat().st_mtime_ns
 
-    base_path = pathlib.Path(DATA_ABS_PATH, fname)  # type: ignore
-    candidates = (base_path, pathlib.Path(f"{base_path}.json"))
+    cached = _DATA_CACHE.get(full_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
 
-    full_path = next((path for path in candidates if path.is_file()), None)
-    if full_path is None:
-        raise FileNotFoundError(f"Data file '{fname}' not found in {DATA_ABS_PATH}")
-
-    with open(full_path, "r") as fobj:
-        fdat = json.load(fobj)
+    raw = full_path.read_bytes()
+    fdat = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    _DATA_CACHE[full_path] = (mtime, fdat)
 
     return fdat
 
@@ -41,15 +63,11 @@ def update_data_file(fname, data):
     :param fname: filename to update. not including suffix or path.
     :param data: data to write.  For json, this should be a dictionary object.
     """
-    base_path = pathlib.Path(DATA_ABS_PATH, fname)  # type: ignore
-    candidates = (base_path, pathlib.Path(f"{base_path}.json"))
-
-    full_path = next((path for path in candidates if path.is_file()), None)
-    if full_path is None:
-        raise FileNotFoundError(f"Data file '{fname}' not found in {DATA_ABS_PATH}")
+    full_path = _data_file_path(fname)
     
     with open(full_path, "w") as fobj:
         json.dump(data, fobj, indent=4, sort_keys=True)
+    _DATA_CACHE.pop(full_path, None) # mtime may not tick on a fast rewrite, so don't rely on it
     
 
 def list_data_files(glob="*"):
@@ -58,6 +76,8 @@ def list_data_files(glob="*"):
 
     :param glob: Description
     """
+    if "/" not in glob and "\\" not in glob: # just names, so match them without building Paths
+        return fnmatch.filter(os.listdir(DATA_ABS_PATH), glob)
     base_path = pathlib.Path(DATA_ABS_PATH)  # type: ignore
     return list(fp.name for fp in base_path.glob(glob))
 
@@ -84,8 +104,12 @@ class CustomFormatter(logging.Formatter):
         logging.CRITICAL: bold_red + format + reset         #type: ignore
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # one formatter per level, built once rather than for every record
+        self._formatters = {level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()}
+        self._default_formatter = logging.Formatter() # custom levels, as before
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self._formatters.get(record.levelno, self._default_formatter).format(record)
 
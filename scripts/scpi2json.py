@@ -14,11 +14,23 @@ You need to:
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
+import logging
 import os
-import pprint
+import random
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from itertools import chain, islice, repeat
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Callable, Dict, List, Any, Iterable, Iterator, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
 
 ailib = None
 llm_client = None
@@ -31,6 +43,11 @@ try:
 except ImportError:
     raise ImportError("Please install PyMuPDF: pip install pymupdf")
 
+try:
+    import tiktoken # optional, for sizing chunks by tokens
+except ImportError:
+    tiktoken = None
+
 # examples...
 # python ./scpi2json.py ./ProgrammingManual_BK8616.pdf -p "28-67" --debug-text
 # python ./scpi2json.py ./ProgrammingManual_BK8616.pdf -p "28-67" --max-chars-per-chunk 2000 --start-line 20 --debug-start
@@ -58,192 +75,684 @@ def get_openai_api_key() -> Tuple[str | None, str | None]:
 # ------------- Utility: page range parsing -------------
 
 
+PAGE_RANGE = re.compile(r"\s*(\d+)\s*(?:-\s*(\d+)\s*)?")
+
 def parse_page_ranges(ranges_str: str) -> List[int]:
     """
     "11-35,73-80,90" -> [11,12,...,35,73,...,80,90]
+
+    Ranges are sorted and merged before expanding, so overlaps never build a set of pages.
+    Raises ValueError on a part that isn't a page or range.
     """
-    print(f">call parse_page_ranges(ranges_str: {ranges_str})")
-    pages: set[int] = set()
+    spans: List[Tuple[int, int]] = []
     for part in ranges_str.split(","):
-        part = part.strip()
-        if not part:
+        if not part.strip():
             continue
-        if "-" in part:
-            a, b = part.split("-", 1)
-            start = int(a)
-            end = int(b)
-            pages.update(range(start, end + 1))
+        match = PAGE_RANGE.fullmatch(part)
+        if match is None:
+            raise ValueError(f"Invalid page range: '{part.strip()}'")
+        start = int(match[1])
+        end = int(match[2]) if match[2] else start
+        if start <= end:
+            spans.append((start, end))
+
+    merged: List[List[int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
         else:
-            pages.add(int(part))
-    return sorted(pages)
+            merged.append([start, end])
+    return list(chain.from_iterable(range(start, end + 1) for start, end in merged))
 
 def get_page_count(pdf_path: Path) -> int:
-    print(f"> get_page_count(pdf_path: {pdf_path})")
     with fitz.open(pdf_path) as pdf:
         return pdf.page_count
 
-def extract_text_for_pages(pdf_path: Path, pages: List[int]) -> Dict[int, str]:
+# ------------- On disk cache -------------
+
+# Page text and LLM responses are kept here between runs, so re-running with different
+# review/output options doesn't redo extraction or pay for the same LLM calls again.
+CACHE_DIR = Path.home() / ".cache" / "scpi2json"
+
+# Bump when the prompts change, so cached LLM responses from the old ones are not reused.
+# (The model and schema are part of the cache key already.)
+PROMPT_VERSION = "2"
+
+def file_hash(path: Path) -> str:
+    """Short content hash of a file, read in blocks so large manuals aren't loaded whole."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()[:16]
+
+def _cache_read(name: str) -> str | None:
+    try:
+        return (CACHE_DIR / name).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+def _cache_write(name: str, text: str) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CACHE_DIR / name).write_text(text, encoding="utf-8")
+    except OSError as e: # a cache we can't write to just means no cache
+        print(f"Unable to write cache file {name}: {e}")
+
+def clear_cache() -> int:
+    """Delete all cached page text and LLM results.  Returns the number of files removed."""
+    removed = 0
+    for path in CACHE_DIR.glob("*"):
+        if path.is_file():
+            path.unlink()
+            removed += 1
+    return removed
+
+# Fewer pages than this are extracted in this process - starting workers costs more than it saves.
+PARALLEL_MIN_PAGES = 16
+
+# Pages per worker task.  Small enough that pages come back in order soon after they're
+# extracted, large enough that each task's document open is shared by a few pages.
+PARALLEL_BLOCK = 4
+
+# How page text is pulled out of PyMuPDF:
+#   text   - get_text("text"), plain text in content stream order (default)
+#   blocks - get_text("blocks"), text blocks joined by newlines, image blocks dropped.  Skips
+#            building the line/span output, which can be quicker on dense pages.
+TEXT_MODES = ("text", "blocks")
+
+def _page_text(page, text_mode: str) -> str:
+    if text_mode == "blocks":
+        # block tuples are (x0, y0, x1, y1, text, block_no, block_type); type 0 is text
+        return "\n".join(b[4] for b in page.get_text("blocks") if b[6] == 0)
+    return page.get_text("text") or ""
+
+def _iter_pages(pdf, pages: List[int], text_mode: str = "text") -> Iterator[Tuple[int, str]]:
+    """Yield (page, text) for some pages of an open document."""
+    for p in pages:
+        idx = p - 1  # PyMuPDF is 0-based internally
+        if 0 <= idx < pdf.page_count:
+            yield p, _page_text(pdf.load_page(idx), text_mode) # type: ignore
+
+# Each worker process's own open document (PyMuPDF objects can't cross processes).  Opened
+# once by the pool initializer and reused for every block that worker gets, rather than
+# parsing the PDF again per block; it's closed when the worker exits.
+_worker_pdf = None
+
+def _open_worker_pdf(pdf_path: Path) -> None:
+    global _worker_pdf
+    _worker_pdf = fitz.open(pdf_path)
+
+def _extract_pages(pages: List[int], text_mode: str = "text") -> List[Tuple[int, str]]:
+    """Worker process task, extracts from the worker's open document."""
+    return list(_iter_pages(_worker_pdf, pages, text_mode))
+
+def iter_page_text(pdf_path: Path, pages: List[int], parallel: bool = True,
+                   text_mode: str = "text", use_cache: bool = True, pdf=None) -> Iterator[Tuple[int, str]]:
     """
     pages are 1-based page numbers from the user's perspective.
-    Returns {page_number: text}
-    """
-    print(f">call extract_text_for_pages\n"+
-          f"(\n"+
-          f">\tpdf_path: {pdf_path}\n"+
-          f">\tpage: {pages if len(pages) < 5 else f"[{pages[0]} ... {pages[-1]}]"}\n"+
-          f">)")
-    page_text: Dict[int, str] = {}
-    with fitz.open(pdf_path) as pdf:
+    Yields (page_number, text) in page order as pages are extracted, so callers can work
+    through a large manual without holding all of its text.
+
+    Text layout is CPU bound, so larger page sets are split across one worker process per
+    core.  Processes, not threads: PyMuPDF is not thread safe, even with separate documents.
+    Set parallel=False to extract everything in this process (e.g. for debugging).
+
+    text_mode is one of TEXT_MODES.
+
+    With use_cache, page text is read from/written to CACHE_DIR keyed by the PDF's content
+    hash, so only pages not seen before are extracted.
+
+    pdf is the document already open at pdf_path, if there is one, for extracting in this
+    process without opening and parsing the file again.
+    """
+    cached: Dict[int, str] = {}
+    to_extract = pages
+    if use_cache:
+        cache_prefix = f"{file_hash(pdf_path)}_{text_mode}_p"
         for p in pages:
-            idx = p - 1  # PyMuPDF is 0-based internally
-            if 0 <= idx < pdf.page_count:
-                text = pdf.load_page(idx).get_text("text") or ""
-                page_text[p] = text # type: ignore
-    return page_text
+            text = _cache_read(f"{cache_prefix}{p}.txt")
+            if text is not None:
+                cached[p] = text
+        to_extract = [p for p in pages if p not in cached]
+        print(f"Using cached text for {len(cached)} of {len(pages)} pages.")
+
+    workers = min(os.cpu_count() or 1, len(to_extract))
+    use_pool = parallel and workers > 1 and len(to_extract) >= PARALLEL_MIN_PAGES
+    if use_pool:
+        source = ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_pdf, initargs=(pdf_path,))
+    elif pdf is not None:
+        source = nullcontext(pdf) # caller owns it, so don't close it
+    else:
+        source = fitz.open(pdf_path) if to_extract else nullcontext()
+    with source as handle:
+        if use_pool:
+            # map hands results back in order, each block as soon as it and those before it are done
+            blocks = [to_extract[i:i + PARALLEL_BLOCK] for i in range(0, len(to_extract), PARALLEL_BLOCK)]
+            extracted = chain.from_iterable(handle.map(_extract_pages, blocks, repeat(text_mode)))
+        else:
+            extracted = _iter_pages(handle, to_extract, text_mode) if to_extract else iter(())
+
+        # merge cached and extracted pages back in page order; pages past the end are skipped
+        upcoming = next(extracted, None)
+        for p in pages:
+            if p in cached:
+                yield p, cached.pop(p)
+            elif upcoming is not None and upcoming[0] == p:
+                if use_cache:
+                    _cache_write(f"{cache_prefix}{p}.txt", upcoming[1])
+                yield upcoming
+                upcoming = next(extracted, None)
+
+def extract_text_for_pages(pdf_path: Path, pages: List[int], parallel: bool = True,
+                           text_mode: str = "text", use_cache: bool = True) -> Dict[int, str]:
+    """
+    pages are 1-based page numbers from the user's perspective.
+    Returns {page_number: text}.  See iter_page_text.
+    """
+    return dict(iter_page_text(pdf_path, pages, parallel, text_mode, use_cache))
+
+# (max pages, max chars per chunk, LLM requests in flight), first row that fits the page count.
+# Short manuals go in a few big chunks; long ones in smaller chunks (SCPI reference pages are
+# dense, so smaller chunks help recall) with more requests at once.
+CHUNKING_STRATEGIES = (
+    (20, 8000, 2),
+    (200, 4000, 8),
+    (None, 2000, 16),
+)
+
+def choose_chunking_strategy(n_pages: int) -> Tuple[int, int]:
+    """Returns (max_chars, llm_concurrency) for a manual of n_pages, see CHUNKING_STRATEGIES."""
+    for max_pages, max_chars, concurrency in CHUNKING_STRATEGIES:
+        if max_pages is None or n_pages <= max_pages:
+            return max_chars, concurrency
+    raise AssertionError("CHUNKING_STRATEGIES must end with a catch-all row")
 
 def make_chunks(page_text: Dict[int, str], max_chars: int = 4000) -> List[Dict[str, Any]]:
     """
     Combine selected pages into chunks of roughly max_chars characters.
+    Returns a list of chunks, see iter_chunks.
+    """
+    return list(iter_chunks(sorted(page_text.items()), max_chars=max_chars))
+
+def token_counter(model: str | None = None) -> Callable[[str], int]:
+    """
+    Returns a function counting tokens in text for model (default LLM_MODEL), for sizing
+    chunks by tokens with iter_chunks.  Needs tiktoken.
+    """
+    if tiktoken is None:
+        raise ImportError("Please install tiktoken to size chunks by tokens: pip install tiktoken")
+    try:
+        encoding = tiktoken.encoding_for_model(model or LLM_MODEL)
+    except KeyError: # model newer than this tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+def iter_chunks(pages: Iterable[Tuple[int, str]], max_chars: int = 4000,
+                measure: Callable[[str], int] = len) -> Iterator[Dict[str, Any]]:
+    """
+    Combine (page, text) pairs, in page order, into chunks of roughly max_chars characters.
+    Chunks are yielded as soon as they fill, so pages can be streamed in.
+
+    measure sizes text; pass a token_counter() to make max_chars a token budget instead.
+    Each page is measured once.
 
     Each chunk overlaps the previous one by up to the last two pages so that
-    commands crossing page boundaries remain intact when sent to the LLM.
+    commands crossing page boundaries remain intact when sent to the LLM.  Pages already
+    carried over once aren't carried again, so no page goes out in more than two chunks.
 
-    Returns a list of:
+    Yields:
       {
         "chunk_id": int,
         "pages": [int, ...],
         "text": str,
       }
     """
-    print(f">call make_chunks\n"+
-          ">(\n"+
-          ">\tpage_text: Dict[int, str],\n"+
-          ">\tmax_chars: {max_chars}\n"+
-          ">)")
-    chunks: List[Dict[str, Any]] = []
-    page_entries: List[Tuple[int, str]] = []
+    chunk_count = 0
+    # (page, entry, len(entry)) - lengths are kept so nothing gets measured twice
+    page_entries: List[Tuple[int, str, int]] = []
     current_len = 0
+    carried = 0 # leading page_entries that were in the previous chunk too
 
-    for page in sorted(page_text.keys()):
-        text = page_text[page]
+    for page, text in pages:
         if not text:
             continue
 
-        entry = f"\n\n---- PAGE {page} ----\n\n{text}"
-        entry_len = len(entry)
+        header = f"\n\n---- PAGE {page} ----\n\n"
+        entry_len = measure(header) + measure(text)
 
         if page_entries and current_len + entry_len > max_chars:
-            chunks.append(
-                {
-                    "chunk_id": len(chunks),
-                    "pages": [p for p, _ in page_entries],
-                    "text": "".join(seg for _, seg in page_entries),
-                }
-            )
-            overlap_count = min(2, len(page_entries))
-            page_entries = page_entries[-overlap_count:].copy()
-            current_len = sum(len(seg) for _, seg in page_entries)
-
-        page_entries.append((page, entry))
+            yield {
+                "chunk_id": chunk_count,
+                "pages": [p for p, _, _ in page_entries],
+                "text": "".join([seg for _, seg, _ in page_entries]),
+            }
+            chunk_count += 1
+            # overlap by up to the last two pages, but not ones carried over already - the
+            # last page alone still covers the boundary
+            carried = min(2, len(page_entries) - carried)
+            page_entries = page_entries[-carried:]
+            current_len = sum(n for _, _, n in page_entries)
+
+        page_entries.append((page, header + text, entry_len))
         current_len += entry_len
 
     if page_entries:
-        chunks.append(
-            {
-                "chunk_id": len(chunks),
-                "pages": [p for p, _ in page_entries],
-                "text": "".join(seg for _, seg in page_entries),
-            }
-        )
-
-    return chunks
+        yield {
+            "chunk_id": chunk_count,
+            "pages": [p for p, _, _ in page_entries],
+            "text": "".join([seg for _, seg, _ in page_entries]),
+        }
 
-def call_llm_extract_commands_openai(chunk_text: str,
-                                     pages: List[int],
-                                     schema: dict) -> List[Dict[str, Any]]:
+# The system prompts (and the schema) are the same for every request, so they form a shared
+# prefix the provider can cache (OpenAI does this automatically for long enough prefixes).
+# Keep anything that varies per chunk - pages, chunk numbers, text - in the user message.
+SYSTEM_PROMPT = (
+    "You extract SCPI commands from datasheet text. "
+    "Output ONLY valid JSON following the provided schema. "
+    "If a command is incomplete or truncated, DO NOT include it. "
+    "Keep descriptions to one short sentence, and leave notes empty unless confidence is low. "
+    "If no complete commands are present, return: {\"commands\": []}"
+)
+
+BATCH_PROMPT = (
+    " The text is split into numbered chunks, each starting with a '===CHUNK n===' line. "
+    "Return one entry in \"chunks\" per chunk, with \"chunk\" set to its number and "
+    "\"commands\" holding only the commands found in that chunk."
+)
+
+def batch_schema(schema: dict) -> dict:
+    """
+    Wrap the single chunk response schema so one response can carry commands for several
+    chunks: {"chunks": [{"chunk": n, "commands": [...]}, ...]}
+    """
+    return {
+        "type": "object",
+        "required": ["chunks"],
+        "additionalProperties": False,
+        "properties": {
+            "chunks": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["chunk", "commands"],
+                    "additionalProperties": False,
+                    "properties": {
+                        "chunk": {"type": "integer"},
+                        "commands": schema["properties"]["commands"],
+                    },
+                },
+            }
+        },
+    }
+
+# Short keys the LLM answers with, and the SCPI_command.json fields they stand for.  Only
+# fields the script uses are asked for - output tokens are most of the time a request takes.
+COMPACT_FIELDS = {
+    "c": "name",
+    "d": "help",
+    "k": "confidence",
+    "i": "incomplete",
+    "n": "extraction_notes",
+}
+
+def compact_schema(schema: dict) -> dict:
+    """
+    Response schema asking for just the COMPACT_FIELDS of each command, under their short
+    keys.  Field definitions (and descriptions) are taken from schema.
     """
-    Takes a chunk of text and returns a list of candidate SCPI commands.
+    fields = schema["properties"]["commands"]["items"]["properties"]
+    return {
+        "type": "object",
+        "required": ["commands"],
+        "additionalProperties": False,
+        "properties": {
+            "commands": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": list(COMPACT_FIELDS),
+                    "additionalProperties": False,
+                    "properties": {short: fields[name] for short, name in COMPACT_FIELDS.items()},
+                },
+            }
+        },
+    }
 
-    text input is raw text extracted from the PDF pages. This text may contain
-    noise, formatting artifacts, and other non-command content.
+def _expand_fields(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rename the short keys of compact_schema commands back to their full field names."""
+    return [{COMPACT_FIELDS.get(k, k): v for k, v in c.items()} for c in commands]
 
-    Commands are extracted by prompting an LLM with instructions to identify SCPI commands,
-    their descriptions, and the source pages they were found on.
+LLM_MODEL = "gpt-4.1-mini"      # or gpt-4o, gpt-4o-mini, etc.
 
-    An API key to use must also be provided.
-    """
-    response = llm_client.responses.create( #type: ignore
-        model="gpt-4.1-mini",      # or gpt-4o, gpt-4o-mini, etc.
+def _openai_request(batch: List[Tuple[str, List[int]]], schema: dict) -> Dict[str, Any]:
+    """Responses API request parameters for a batch of (chunk text, pages)."""
+    if len(batch) == 1:
+        prompt = SYSTEM_PROMPT
+        user_text = batch[0][0]
+        name = "scpi_extract"
+    else:
+        prompt = SYSTEM_PROMPT + BATCH_PROMPT
+        user_text = "\n".join(f"===CHUNK {i} (pages {pages[0]}-{pages[-1]})===\n{text}"
+                               for i, (text, pages) in enumerate(batch))
+        schema = batch_schema(schema)
+        name = "scpi_extract_batch"
+
+    return dict(
+        model=LLM_MODEL,
+        # requests sharing a key are routed to the same cache, so runs and batches all reuse
+        # the cached system prompt and schema prefix
+        prompt_cache_key=f"scpi2json-v{PROMPT_VERSION}",
         input=[
             {
                 "role": "system",
-                "content": (
-                    "You extract SCPI commands from datasheet text. "
-                    "Output ONLY valid JSON following the provided schema. "
-                    "If a command is incomplete or truncated, DO NOT include it. "
-                    "If no complete commands are present, return: {\"commands\": []}"
-                )
+                "content": prompt
             },
             {
                 "role": "user",
-                "content": chunk_text
+                "content": user_text
             }
         ],
         temperature=0,
         text={
             "format": {
                 "type": "json_schema",
-                "name": "scpi_extract",
+                "name": name,
                 "schema": schema,
                 "strict": True
             }
         }
     )
 
+def _openai_commands(batch: List[Tuple[str, List[int]]], output_text: str) -> List[List[Dict[str, Any]]]:
+    """Split a response's JSON text back into commands per chunk of batch."""
     # The Responses API returns the JSON as text; load it into Python dict.
-    result = json.loads(response.output_text)
-    # Schema wraps commands in {"commands": [...]} for OpenAI structured outputs
-    return result.get("commands", [])
+    result = json.loads(output_text)
+    if len(batch) == 1:
+        # Schema wraps commands in {"commands": [...]} for OpenAI structured outputs
+        return [_expand_fields(result.get("commands", []))]
+
+    by_chunk = {entry["chunk"]: _expand_fields(entry["commands"]) for entry in result.get("chunks", [])}
+    missing = [i for i in range(len(batch)) if i not in by_chunk]
+    if missing:
+        raise ValueError(f"Batched response is missing chunk(s) {missing}")
+    return [by_chunk[i] for i in range(len(batch))]
+
+async def call_llm_extract_commands_openai(batch: List[Tuple[str, List[int]]],
+                                     schema: dict) -> List[List[Dict[str, Any]]]:
+    """
+    Takes a batch of (chunk text, pages) and returns a list of candidate SCPI commands for
+    each chunk, in the same order.
+
+    text input is raw text extracted from the PDF pages. This text may contain
+    noise, formatting artifacts, and other non-command content.
+
+    Commands are extracted by prompting an LLM with instructions to identify SCPI commands,
+    their descriptions, and the source pages they were found on.
+
+    Several chunks share one request (and its round trip) when batched; the response is
+    keyed by chunk number and split back up here.  Raises ValueError if a batched response
+    does not account for every chunk.
+
+    Only the user message changes between requests.  Don't put chunk-specific data in the
+    system prompt - it would break server side prefix caching.
+
+    An API key to use must also be provided.
+    """
+    request = _openai_request(batch, schema)
+    # passed through extra_body so older openai packages without the argument still work
+    request["extra_body"] = {"prompt_cache_key": request.pop("prompt_cache_key")}
+    response = await llm_client.responses.create(**request) #type: ignore
+    return _openai_commands(batch, response.output_text)
+
+# Seconds between checks on a submitted batch job
+BATCH_POLL_SECONDS = 60
+
+async def submit_batch_job_openai(batches: List[List[Tuple[str, List[int]]]],
+                                  schema: dict) -> List[List[List[Dict[str, Any]]] | None]:
+    """
+    Send batches through the OpenAI Batch API as one job and wait for it to finish.  Jobs
+    are billed at half price and aren't rate limited like direct requests, but can take up
+    to a day - use it for unattended runs.
 
-def extract_commands_from_chunks(chunks: List[Dict[str, Any]],
-                                 ai_framework: str) -> List[Dict[str, Any]]:
+    Returns the commands per chunk for each batch, like call_llm_extract_commands_openai, or
+    None for a batch whose request failed or couldn't be parsed (retry those directly).
     """
-    Loop over chunks, call the LLM, and collect candidate commands.
+    lines = [json.dumps({"custom_id": f"batch-{i}", "method": "POST", "url": "/v1/responses",
+                         "body": _openai_request(batch, schema)})
+             for i, batch in enumerate(batches)]
+    upload = await llm_client.files.create( #type: ignore
+        file=("batch_requests.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    job = await llm_client.batches.create( #type: ignore
+        input_file_id=upload.id, endpoint="/v1/responses", completion_window="24h")
+    print(f"Submitted batch job {job.id} with {len(batches)} request(s), waiting for it to finish...")
+
+    while job.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        job = await llm_client.batches.retrieve(job.id) #type: ignore
+        print(f"Batch job {job.id}: {job.status}")
+
+    results: List[List[List[Dict[str, Any]]] | None] = [None] * len(batches)
+    if job.status != "completed" or not job.output_file_id:
+        print(f"Batch job {job.id} ended as {job.status}.")
+        return results
+
+    output = await llm_client.files.content(job.output_file_id) #type: ignore
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        i = int(entry["custom_id"].removeprefix("batch-"))
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            continue
+        # output_text is an SDK convenience; in the raw body it's inside the message output
+        output_text = "".join(part["text"] for item in response["body"].get("output", [])
+                              if item.get("type") == "message"
+                              for part in item.get("content", []) if part.get("type") == "output_text")
+        try:
+            results[i] = _openai_commands(batches[i], output_text)
+        except (ValueError, KeyError, TypeError):
+            pass
+    return results
+
+@dataclass(slots=True)
+class Command:
+    """
+    A candidate command, normalized (stripped) once as it comes back from the LLM and passed
+    as is through dedupe, review and schema mapping.
+    """
+    command: str
+    description: str
+    source_pages: List[int]
+
+# Something that looks like a SCPI mnemonic (":VOLTage", "*RST", or a bare "VOLTage" or "OUTP"
+# as command tables often list them).  Chunks with fewer than PREFILTER_MIN_MATCHES of these
+# (tables of contents, indexes, blank pages) aren't sent.
+SCPI_TOKEN_RE = re.compile(r"[:*][A-Z]{2,}|\b[A-Z]{3,}[a-z]*\b")
+PREFILTER_MIN_MATCHES = 3
+
+def _likely_scpi_chunk(text: str) -> bool:
+    # stop looking as soon as there are enough matches
+    return len(list(islice(SCPI_TOKEN_RE.finditer(text), PREFILTER_MIN_MATCHES))) >= PREFILTER_MIN_MATCHES
+
+# Attempts per LLM request, and the longest wait between them (seconds)
+LLM_ATTEMPTS = 6
+LLM_RETRY_MAX_WAIT = 60
+
+def _retry_wait(e: Exception, attempt: int) -> float | None:
     """
-    print(f"> extract_commands_from_chunks(chunks: List[Dict[str, Any]])")
-    all_candidates: List[Dict[str, Any]] = []
+    Seconds to wait before retrying after e, or None if it isn't worth retrying.  Rate
+    limits, timeouts, connection drops and server errors are retried, honouring the
+    server's Retry-After when given, else exponential backoff with jitter.
+    """
+    status = getattr(e, "status_code", None)
+    if status is None:
+        if type(e).__name__ not in ("APIConnectionError", "APITimeoutError"):
+            return None
+    elif status not in (408, 409, 429) and status < 500:
+        return None
+    response = getattr(e, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), LLM_RETRY_MAX_WAIT) # type: ignore
+    except (TypeError, ValueError): # missing, or an HTTP date - just back off
+        return min(2 ** attempt, LLM_RETRY_MAX_WAIT) * random.uniform(0.5, 1.0)
+
+async def _call_with_retries(call_llm_extract_commands, batch: List[Tuple[str, List[int]]],
+                             schema: dict) -> List[List[Dict[str, Any]]]:
+    attempt = 0
+    while True:
+        try:
+            return await call_llm_extract_commands(batch, schema)
+        except Exception as e:
+            wait = _retry_wait(e, attempt)
+            attempt += 1
+            if wait is None or attempt == LLM_ATTEMPTS:
+                raise
+            print(f"LLM request failed ({e}), retrying in {wait:.1f} s.")
+            await asyncio.sleep(wait)
+
+async def _extract_batch(call_llm_extract_commands, batch: List[Tuple[str, List[int]]], label: str,
+                         schema: dict) -> List[List[Dict[str, Any]]]:
+    """
+    Run one batch through the LLM, retrying rate limits and transient errors (see
+    _retry_wait).  If the batch can't be split back into chunks, its chunks are retried one
+    per request.
+    """
+    try:
+        try:
+            return await _call_with_retries(call_llm_extract_commands, batch, schema)
+        except (ValueError, KeyError, TypeError) as e: # includes json errors
+            if len(batch) == 1:
+                raise
+            print(f"Batched response for chunks {label} was unusable ({e}), "
+                  f"retrying one chunk at a time.")
+            return [(await _call_with_retries(call_llm_extract_commands, [item], schema))[0] for item in batch]
+    except Exception as e:
+        raise SystemExit(f"Failed to extract commands on chunks {label}. Failure was:\n\t{str(e)}")
+
+async def extract_commands_from_chunks(chunks: Iterable[Dict[str, Any]],
+                                       ai_framework: str,
+                                       batch_size: int = 4,
+                                       concurrency: int = 8,
+                                       use_cache: bool = True,
+                                       prefilter: bool = True,
+                                       batch_job: bool = False) -> List[Command]:
+    """
+    Call the LLM on chunks as they arrive and collect candidate commands.
+
+    chunks may be a lazy iterator (e.g. iter_chunks over iter_page_text).  It is stepped in a
+    worker thread, so extracting later pages carries on while earlier chunks are with the LLM
+    and total time is closer to the slower of the two than their sum.
+
+    Chunks are sent batch_size at a time in a single request, with up to concurrency
+    requests in flight at once and up to concurrency batches queued behind them.  Results
+    are collected in chunk order.
+
+    With use_cache, each chunk's commands are read from/written to CACHE_DIR keyed by the
+    chunk text, model, schema and PROMPT_VERSION, and only uncached chunks are sent.
+
+    With prefilter, chunks with hardly anything that looks like a SCPI command are skipped
+    (see _likely_scpi_chunk) rather than spending a request on them.
+
+    With batch_job, all batches go in a single Batch API job once every chunk is made,
+    instead of as direct requests; batches the job fails on are then sent directly.
+    """
+    all_candidates: List[Command] = []
 
     if ai_framework == "OpenAI":
         call_llm_extract_commands = call_llm_extract_commands_openai
+        submit_batch_job = submit_batch_job_openai
         print(f"Extracting commands using LLM framework: {ai_framework}")
     else:
         raise SystemExit(f"No 'call_llm_extract_commands_?' function found for framework {ai_framework} - needs to be added!")
 
-    scpi_schema = load_data_file("./schemas/SCPI_Command.json")
+    scpi_schema = compact_schema(load_data_file("./schemas/SCPI_Command.json"))
+    batch_size = max(1, batch_size)
+    concurrency = max(1, concurrency)
+    key_base = LLM_MODEL + PROMPT_VERSION + json.dumps(scpi_schema, sort_keys=True)
 
-    for idx, chunk in enumerate(chunks):
-        text = chunk["text"]
-        pages = chunk["pages"]
+    chunk_pages: List[List[int]] = [] # chunk text is dropped once sent, only pages are kept
+    chunk_commands: Dict[int, List[Dict[str, Any]]] = {}
+    cache_names: Dict[int, str] = {}
+    cache_misses: List[int] = []
+    skipped: List[int] = []
+    # batches of (chunk index, text, pages); None tells a consumer to stop
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
 
-        try:
-            commands = call_llm_extract_commands(text, pages, scpi_schema)
-        except Exception as e:
-            raise SystemExit(f"Failed to extract commands on chunk {idx+1}. Failure was:\n\t{str(e)}")
-
-        for k in commands:
-            print(f"{k["name"]}: {k["confidence"]} confidence, partial={k["incomplete"]}, notes: {k["extraction_notes"]}")
-        pprint.pp(commands)
-        raise SystemExit("extracted one")
+    held: List[List[Tuple[int, str, List[int]]]] = [] # batches waiting for a batch job
 
+    async def send(batch):
+        if batch_job:
+            held.append(batch)
+        else:
+            await queue.put(batch)
+
+    def store(batch, results):
+        for (idx, _, _), commands in zip(batch, results):
+            chunk_commands[idx] = commands
+            if use_cache:
+                _cache_write(cache_names[idx], json.dumps(commands))
+
+    async def produce():
+        chunk_iter = iter(chunks)
+        batch: List[Tuple[int, str, List[int]]] = []
+        while (chunk := await asyncio.to_thread(next, chunk_iter, None)) is not None:
+            idx = len(chunk_pages)
+            chunk_pages.append(chunk["pages"])
+            if prefilter and not _likely_scpi_chunk(chunk["text"]):
+                skipped.append(idx)
+                chunk_commands[idx] = []
+                continue
+            if use_cache:
+                cache_names[idx] = f"llm_{hashlib.sha256((key_base + chunk["text"]).encode()).hexdigest()[:32]}.json"
+                cached = _cache_read(cache_names[idx])
+                if cached is not None:
+                    chunk_commands[idx] = json.loads(cached)
+                    continue
+            cache_misses.append(idx)
+            batch.append((idx, chunk["text"], chunk["pages"]))
+            if len(batch) == batch_size:
+                await send(batch)
+                batch = []
+        if batch:
+            await send(batch)
+        if held:
+            job_results = await submit_batch_job([[(text, pages) for _, text, pages in b] for b in held],
+                                                 scpi_schema)
+            failed = [b for b, results in zip(held, job_results) if results is None]
+            for b, results in zip(held, job_results):
+                if results is not None:
+                    store(b, results)
+            if failed:
+                print(f"{len(failed)} batch(es) failed in the batch job, sending them directly.")
+            for b in failed:
+                await queue.put(b)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def consume():
+        while (batch := await queue.get()) is not None:
+            ids = [idx for idx, _, _ in batch]
+            results = await _extract_batch(call_llm_extract_commands, [(text, pages) for _, text, pages in batch],
+                                           f"{ids[0]+1}-{ids[-1]+1}", scpi_schema)
+            store(batch, results)
+
+    await asyncio.gather(produce(), *[consume() for _ in range(concurrency)])
+    print(f"Processed {len(chunk_pages)} chunk(s), {len(chunk_pages) - len(skipped) - len(cache_misses)} "
+          f"from cached LLM results, {len(skipped)} skipped by the prefilter.")
+    if skipped:
+        print(f"Skipped chunk(s) with no likely SCPI commands (pages {sorted({p for idx in skipped for p in chunk_pages[idx]})}); "
+              f"use --no-prefilter to send them anyway.")
+
+    for idx, pages in enumerate(chunk_pages):
+        commands = chunk_commands[idx]
+        logger.debug("chunk %d (pages %s): %d commands", idx + 1, pages, len(commands))
         for c in commands:
-            # make sure required keys exist
-            cmd = {
-                "command": c.get("command", "").strip(),
-                "description": c.get("description", "").strip(),
-                "source_pages": c.get("source_pages", pages),
-            }
-            if cmd["command"]:
-                all_candidates.append(cmd)
+            logger.debug("  %s: %s confidence, incomplete=%s, notes: %s", c.get("name"), c.get("confidence"),
+                         c.get("incomplete"), c.get("extraction_notes"))
+            # fields are per SCPI_command.json; make sure required keys exist
+            command = (c.get("name") or "").strip()
+            if command:
+                all_candidates.append(Command(command, (c.get("help") or "").strip(), pages))
 
     return all_candidates
 
@@ -251,42 +760,44 @@ def extract_commands_from_chunks(chunks: List[Dict[str, Any]],
 # ------------- Deduplication / normalization -------------
 
 
-def dedupe_commands(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def dedupe_commands(candidates: List[Command]) -> List[Command]:
     """
     Deduplicate by command string (exact match).
     Merge source_pages when duplicates appear.
     """
-    seen: Dict[str, Dict[str, Any]] = {}
+    seen: Dict[str, Command] = {}
+    seen_pages: Dict[str, set[int]] = {} # merged as sets, sorted once at the end
 
     for c in candidates:
-        key = c["command"].strip()
+        key = c.command
         if not key:
             continue
 
-        if key not in seen:
-            seen[key] = {
-                "command": key,
-                "description": c.get("description", ""),
-                "source_pages": list(sorted(set(c.get("source_pages", [])))),
-            }
+        pages = seen_pages.get(key)
+        if pages is None:
+            seen[key] = Command(key, c.description, [])
+            seen_pages[key] = set(c.source_pages)
         else:
             # merge pages; keep existing description
-            existing = seen[key]
-            existing_pages = set(existing.get("source_pages", []))
-            new_pages = set(c.get("source_pages", []))
-            existing["source_pages"] = list(sorted(existing_pages | new_pages))
+            pages.update(c.source_pages)
 
+    for key, cmd in seen.items():
+        cmd.source_pages = sorted(seen_pages[key])
     return list(seen.values())
 
 
 # ------------- Interactive review (CLI) -------------
 
 
-def interactive_review(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def interactive_review(commands: List[Command]) -> List[Command]:
     """
     Let user review and select which commands to keep.
 
     Simple pagination & toggling by index.
+
+    On a terminal the page is drawn once, and selection changes only rewrite the marks that
+    changed (ANSI cursor moves) rather than printing the whole page again.  Output that isn't a
+    terminal, or pages too big for it, get the full page printed each time.
     """
     if not commands:
         print("No commands to review.")
@@ -296,41 +807,86 @@ def interactive_review(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     page_size = 10
     current_page = 0
 
-    def show_page():
+    use_ansi = sys.stdout.isatty()
+    shown_page = None # page currently on screen (ANSI mode), None to redraw
+    shown_marks: Dict[int, bool] = {} # command index -> selection drawn on screen
+    mark_rows: Dict[int, int] = {} # command index -> screen row of its mark
+    footer_row = 0
+
+    def page_lines() -> List[Tuple[int | None, str]]:
+        """(command index or None, text) for each line of the current page."""
         start = current_page * page_size
         end = min(start + page_size, len(commands))
-        print("")
-        print(f"Showing commands {start + 1}–{end} of {len(commands)}:")
-        print("-" * 60)
+        lines: List[Tuple[int | None, str]] = [
+            (None, ""),
+            (None, f"Showing commands {start + 1}–{end} of {len(commands)}:"),
+            (None, "-" * 60),
+        ]
         for idx in range(start, end):
             c = commands[idx]
             mark = "[x]" if selected[idx] else "[ ]"
-            print(
-                f"{mark} {idx + 1:3d}) {c['command']}  "
-                f"({', '.join(str(p) for p in c.get('source_pages', []))})"
-            )
-            if c.get("description"):
-                print(f"     {c['description']}")
-        print("-" * 60)
-        print(
+            lines.append((idx,
+                f"{mark} {idx + 1:3d}) {c.command}  "
+                f"({', '.join(str(p) for p in c.source_pages)})"
+            ))
+            if c.description:
+                lines.append((None, f"     {c.description}"))
+        lines.append((None, "-" * 60))
+        lines.append((None,
             "Commands: n=next page, p=prev page, "
             "e=edit selection, a=accept all, d=deselect all, q=finish"
-        )
+        ))
+        return lines
 
+    def show_page():
+        nonlocal shown_page, footer_row
+        if use_ansi and shown_page == current_page: # same page, so just fix changed marks
+            out = []
+            for idx, row in mark_rows.items():
+                if shown_marks[idx] != selected[idx]:
+                    out.append(f"\x1b[{row};2H{'x' if selected[idx] else ' '}")
+                    shown_marks[idx] = selected[idx]
+            out.append(f"\x1b[{footer_row + 1};1H\x1b[J") # clear old prompts below the page
+            sys.stdout.write("".join(out))
+            sys.stdout.flush()
+            return
+
+        lines = page_lines()
+        columns, rows = shutil.get_terminal_size()
+        if not use_ansi or len(lines) + 3 > rows or any(len(text) >= columns for _, text in lines):
+            shown_page = None # won't fit (or no terminal), so rows can't be tracked
+            print("\n".join(text for _, text in lines))
+            return
+
+        sys.stdout.write("\x1b[2J\x1b[H" + "\n".join(text for _, text in lines) + "\n")
+        sys.stdout.flush()
+        shown_page = current_page
+        mark_rows.clear()
+        shown_marks.clear()
+        for row, (idx, _) in enumerate(lines, start=1):
+            if idx is not None:
+                mark_rows[idx] = row
+                shown_marks[idx] = selected[idx]
+        footer_row = len(lines)
+
+    message = ""
     while True:
         show_page()
+        if message:
+            print(message)
+            message = ""
         cmd = input("> ").strip().lower()
 
         if cmd == "n":
             if (current_page + 1) * page_size < len(commands):
                 current_page += 1
             else:
-                print("Already at last page.")
+                message = "Already at last page."
         elif cmd == "p":
             if current_page > 0:
                 current_page -= 1
             else:
-                print("Already at first page.")
+                message = "Already at first page."
         elif cmd == "a":
             selected = [True] * len(commands)
         elif cmd == "d":
@@ -339,27 +895,19 @@ def interactive_review(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             indices_str = input(
                 "Enter indices or ranges to toggle (e.g. '4, 10-12'): "
             ).strip()
-            for part in indices_str.split(","):
-                part = part.strip()
-                if not part:
-                    continue
-                if "-" in part:
-                    a, b = part.split("-", 1)
-                    start = int(a)
-                    end = int(b)
-                    for i in range(start, end + 1):
-                        idx = i - 1
-                        if 0 <= idx < len(selected):
-                            selected[idx] = not selected[idx]
-                else:
-                    i = int(part)
-                    idx = i - 1
-                    if 0 <= idx < len(selected):
-                        selected[idx] = not selected[idx]
+            try:
+                indices = parse_page_ranges(indices_str)
+            except ValueError as e:
+                message = str(e)
+                continue
+            for i in indices: # each index toggles once, even if listed twice
+                idx = i - 1
+                if 0 <= idx < len(selected):
+                    selected[idx] = not selected[idx]
         elif cmd == "q":
             break
         else:
-            print("Unknown command. Use n, p, e, a, d, or q.")
+            message = "Unknown command. Use n, p, e, a, d, or q."
 
     filtered = [c for c, keep in zip(commands, selected) if keep]
     print(f"\nSelected {len(filtered)} out of {len(commands)} commands.")
@@ -369,9 +917,21 @@ def interactive_review(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 # ------------- Schema mapping / output -------------
 
 
-def map_to_schema(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+# A SCPI command header: an IEEE 488.2 common command (*RST, *IDN?), or colon separated
+# mnemonics, each optionally [bracketed] (colon inside or out: [SOURce:]VOLTage[:LEVel]) and
+# with a numeric suffix placeholder (<n>), with an optional trailing '?'.  A trailing colon is
+# only allowed inside brackets and mnemonics are matched possessively, so there is one way to
+# split a header and long non-commands fail fast instead of backtracking.
+_SCPI_MNEMONIC = r"[A-Za-z][A-Za-z0-9]*+(?:<[^>]*>)?"
+SCPI_RE = re.compile(
+    r"\*[A-Za-z]+\??"
+    rf"|(?:\[:?{_SCPI_MNEMONIC}:?\]|:?{_SCPI_MNEMONIC})+\??"
+)
+
+def map_to_schema(commands: List[Command]) -> List[Dict[str, Any]]:
     """
     Map simple command dicts to a minimal JSON schema.
+    Commands that aren't valid SCPI headers (see SCPI_RE) are skipped.
 
     Example output per command:
       {
@@ -383,11 +943,15 @@ def map_to_schema(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
       }
     """
     result: List[Dict[str, Any]] = []
+    skipped = 0
 
     for c in commands:
-        raw = c["command"].strip()
+        raw = c.command
         if not raw:
             continue
+        if not SCPI_RE.fullmatch(raw):
+            skipped += 1
+            continue
 
         is_query = raw.endswith("?")
         path = raw[:-1] if is_query else raw
@@ -396,19 +960,62 @@ def map_to_schema(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             "path": path,
             "query": is_query,
             "set": not is_query,
-            "description": c.get("description", ""),
-            "source_pages": c.get("source_pages", []),
+            "description": c.description,
+            "source_pages": c.source_pages,
         }
         result.append(item)
 
+    if skipped:
+        print(f"Skipped {skipped} command(s) that aren't valid SCPI headers.")
     return result
 
 
 def write_json(data: Any, out_path: Path) -> None:
-    out_path.write_text(json.dumps(data, indent=2))
+    # dump straight to the file rather than building the whole string first
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
     print(f"Wrote {len(data)} commands to {out_path}")
 
 
+# ------------- Page stream helpers -------------
+
+
+def skip_start_lines(pages: Iterable[Tuple[int, str]], start_line: int) -> Iterator[Tuple[int, str]]:
+    """
+    Drop lines before start_line (1-based) from the first page, passing the rest through.
+    """
+    pages = iter(pages)
+    first = next(pages, None)
+    if first is None:
+        return
+    first_page, text = first
+    # count and cut with one pass each rather than splitting the page into a list of lines
+    n_lines = text.count("\n") + (not text.endswith("\n")) if text else 0
+    print(f"Start page {first_page} has {n_lines} lines. Starting at line {start_line}")
+    if start_line > n_lines:
+        print(f"Start line is past end of page... skipping this page.")
+        text = ""
+    else:
+        # start_line is 1-based, so the rest of the page is after the (start_line - 1)th newline
+        text = text.split("\n", start_line - 1)[-1]
+        print(f"Skipped first {start_line - 1} lines on page {first_page}.")
+        print(f"First line is now...")
+        print(f">>> {text.split("\n", 1)[0].strip()}")
+    yield first_page, text
+    yield from pages
+
+def write_pages(pages: Iterable[Tuple[int, str]], f: TextIO, written: List[int]) -> Iterator[Tuple[int, str]]:
+    """
+    Write each page to f as it passes through, recording its number in written.
+    """
+    for page, text in pages:
+        if written:
+            f.write("\n\n")
+        f.write(f"---- PAGE {page} ----\n{text}")
+        written.append(page)
+        yield page, text
+
+
 # ------------- CLI entrypoint -------------
 
 
@@ -444,8 +1051,29 @@ def run_cli(argv: List[str] | None = None) -> None:
     parser.add_argument(
         "--max-chars-per-chunk",
         type=int,
-        default=4000,
-        help="Maximum characters per chunk sent to the LLM.",
+        default=None,
+        help="Maximum characters per chunk sent to the LLM.  Defaults by page count: "
+        "8000 up to 20 pages, 4000 up to 200, 2000 beyond.",
+    )
+    parser.add_argument(
+        "--max-tokens-per-chunk",
+        type=int,
+        default=None,
+        help="Size chunks by LLM tokens instead of characters, up to this many per chunk "
+        "(needs tiktoken).  Overrides --max-chars-per-chunk.",
+    )
+    parser.add_argument(
+        "--llm-batch-size",
+        type=int,
+        default=4,
+        help="Number of chunks sent to the LLM in each request.",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=None,
+        help="Maximum number of LLM requests in flight at once.  Defaults by page count: "
+        "2 up to 20 pages, 8 up to 200, 16 beyond.",
     )
     parser.add_argument(
         "--debug-text",
@@ -457,6 +1085,45 @@ def run_cli(argv: List[str] | None = None) -> None:
         action="store_true",
         help="Stop after writing extracting text - use to fine tune pages and start line arguments.",
     )
+    parser.add_argument(
+        "--no-parallel",
+        action="store_true",
+        help="Extract page text in a single process (slower, but simpler to debug).",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Send all chunks as one OpenAI Batch API job (half the cost, but can take hours). "
+        "Best with --no-review for unattended runs.",
+    )
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="Send every chunk to the LLM, even ones with nothing that looks like a SCPI command.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Don't read or write cached page text and LLM results (kept in {CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete cached page text and LLM results before running.",
+    )
+    parser.add_argument(
+        "--text-mode",
+        choices=TEXT_MODES,
+        default="text",
+        help="How to extract page text: 'text' (plain text, default) or 'blocks' (text blocks, "
+        "skips line layout output; compare both on your manual).",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Log each chunk's extracted commands, with the LLM's confidence and notes.",
+    )
     parser.add_argument(
         "--start-line",
         type=int,
@@ -466,94 +1133,115 @@ def run_cli(argv: List[str] | None = None) -> None:
     )
 
     args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
 
     pdf_path: Path = args.pdf_path
     out_path: Path = args.out
     pages_str: str = args.pages
     no_review: bool = args.no_review
-    max_chars: int = args.max_chars_per_chunk
+    max_chars: int | None = args.max_chars_per_chunk
+    llm_concurrency: int | None = args.llm_concurrency
     start_line: int = args.start_line
 
+    if args.clear_cache:
+        print(f"Cleared {clear_cache()} cached file(s) from {CACHE_DIR}.")
+
     if not pdf_path.exists():
         raise SystemExit(f"PDF not found: {pdf_path}")
     print(f"Extracting from PDF: {pdf_path}")
+    # Opened once for the page count and any in-process extraction (worker processes open
+    # their own), and closed once every page has been extracted.
+    with fitz.open(pdf_path) as pdf:
 
-    # If no pages specified, select on command line.
-    if not pages_str:
-        page_count = get_page_count(pdf_path)
-        print(f"PDF has {page_count} pages.")
-        pages_str = input(
-            "Enter ranges of pages that contain SCPI commands (e.g. 11-35,73-80): "
-        ).strip()
-    page_list = parse_page_ranges(pages_str)
-
-    if not page_list:
-        raise SystemExit("No valid pages specified.")
-    print(f"Working from {len(page_list)} pages.")
-
-    # Extract text from given range of pages.
-    page_text = extract_text_for_pages(pdf_path, page_list)
-    if not page_text:
-        raise SystemExit("No text extracted from the specified pages.")
+        # If no pages specified, select on command line.
+        if not pages_str:
+            page_count = pdf.page_count
+            print(f"PDF has {page_count} pages.")
+            pages_str = input(
+                "Enter ranges of pages that contain SCPI commands (e.g. 11-35,73-80): "
+            ).strip()
+        page_list = parse_page_ranges(pages_str)
+
+        if not page_list:
+            raise SystemExit("No valid pages specified.")
+        print(f"Working from {len(page_list)} pages.")
+
+        # Size chunks and LLM concurrency to the manual, unless given
+        auto_chars, auto_concurrency = choose_chunking_strategy(len(page_list))
+        if max_chars is None:
+            max_chars = auto_chars
+        if llm_concurrency is None:
+            llm_concurrency = auto_concurrency
+        if args.max_tokens_per_chunk:
+            try:
+                measure = token_counter()
+            except ImportError as e:
+                raise SystemExit(str(e))
+            max_chars = args.max_tokens_per_chunk
+            print(f"Using chunks of up to {max_chars} tokens, {llm_concurrency} LLM requests at once.")
+        else:
+            measure = len
+            print(f"Using chunks of up to {max_chars} characters, {llm_concurrency} LLM requests at once.")
 
-    # Apply start-line offset to the first page if specified
-    if start_line > 1 and page_list:
-        first_page = min(page_text.keys())
-        if first_page in page_text:
-            lines = page_text[first_page].splitlines(keepends=True)
-            print(f"Start page {first_page} has {len(lines)} lines. Starting at line {start_line}")
-            if start_line > len(lines):
-                print(f"Start line is past end of page... skipping this page.")
-                page_text[first_page] = ""
-            else:
-                # start_line is 1-based, so slice from index (start_line - 1)
-                page_text[first_page] = "".join(lines[start_line - 1:])
-                print(f"Skipped first {start_line - 1} lines on page {first_page}.")
-                print(f"First line is now...")
-                print(f">>> {page_text[first_page].splitlines()[0].strip()}")
-    if out_path.suffix:
-        debug_text_path = out_path.with_suffix(".txt")
-    else:
-        debug_text_path = out_path.with_name(out_path.name + ".txt")
+        # Extract text from given range of pages.  Pages are streamed through trimming, the debug
+        # text file and chunking, so the whole manual's text is never held at once.
+        page_iter = iter_page_text(pdf_path, page_list, parallel=not args.no_parallel,
+                                   text_mode=args.text_mode, use_cache=not args.no_cache, pdf=pdf)
 
-    if args.debug_start:
-        raise SystemExit("Debug start flag was set - exiting after selecting start.")
+        # Apply start-line offset to the first page if specified
+        if start_line > 1:
+            page_iter = skip_start_lines(page_iter, start_line)
 
-    # Sort pages by page number
-    sorted_pages = sorted(page_text.items())
-    debug_chunks = [f"---- PAGE {page} ----\n{text}" for page, text in sorted_pages]
-    debug_text_path.write_text("\n\n".join(debug_chunks))
-    print(f"Wrote extracted text to {debug_text_path} from {len(page_text)} pages.")
+        if args.debug_start:
+            next(page_iter, None) # only the first page is needed to check the start
+            raise SystemExit("Debug start flag was set - exiting after selecting start.")
+
+        if out_path.suffix:
+            debug_text_path = out_path.with_suffix(".txt")
+        else:
+            debug_text_path = out_path.with_name(out_path.name + ".txt")
+
+        # Set up the LLM before extracting, since chunks go to it as soon as they're made
+        if not args.debug_text:
+            ai_framework, ai_api_key = get_openai_api_key()
+            if ai_framework == "OpenAI":
+                global ailib # yucky
+                global llm_client
+                try:
+                    from openai import AsyncOpenAI as ailib
+                except (ImportError) as e:
+                    raise SystemExit(f"Unable to import openai (API key was for OpenAI) - check this is installed!")
+                llm_client = ailib(api_key=os.getenv("OPENAI_API_KEY"))
+            else:
+                raise SystemExit(f"No LLM API keys - please set one of the following environment variables:\n"
+                      f"\tOPENAI_API_KEY: When using OpenAI")
+
+        written_pages: List[int] = []
+        with debug_text_path.open("w") as debug_file:
+            page_iter = write_pages(page_iter, debug_file, written_pages)
+            if args.debug_text:
+                for _ in page_iter:
+                    pass
+            else:
+                # Create chunks for better LLM submission, and do the actual extraction as they come
+                chunks = iter_chunks(page_iter, max_chars=max_chars, measure=measure)
+                candidates = asyncio.run(extract_commands_from_chunks(chunks, ai_framework, #type: ignore
+                                                                      batch_size=args.llm_batch_size,
+                                                                      concurrency=llm_concurrency,
+                                                                      use_cache=not args.no_cache,
+                                                                      prefilter=not args.no_prefilter,
+                                                                      batch_job=args.batch))
+
+    if not written_pages:
+        raise SystemExit("No text extracted from the specified pages.")
+    print(f"Wrote extracted text to {debug_text_path} from {len(written_pages)} pages.")
 
     if args.debug_text:
         raise SystemExit("Debug text flag was set - exiting after writing extracted text.")
 
-    # Create chunks for better LLM submission... 
-    chunks = make_chunks(page_text, max_chars=max_chars)
-    print(f"Created {len(chunks)} chunk(s) for LLM processing.")
-
-    # Do actual extration
-    ai_framework, ai_api_key = get_openai_api_key()
-    if ai_framework == "OpenAI":
-        global ailib # yucky
-        global llm_client
-        try:
-            from openai import OpenAI as ailib
-        except (ImportError) as e:
-            raise SystemExit(f"Unable to import openai (API key was for OpenAI) - check this is installed!")
-        llm_client = ailib(api_key=os.getenv("OPENAI_API_KEY"))
-    else:
-        raise SystemExit(f"No LLM API keys - please set one of the following environment variables:\n"
-              f"\tOPENAI_API_KEY: When using OpenAI")
-    
-    # Try and import selected AI framework and set to global so other methods can use...
-    
-
-    candidates = extract_commands_from_chunks(chunks, ai_framework) #type: ignore
     print(f"LLM returned {len(candidates)} candidate command entries.")
 
-    return
-
     # 4) Dedup
     unique_cmds = dedupe_commands(candidates)
     print(f"After deduplication: {len(unique_cmds)} unique commands.")
@@ -39,6 +39,31 @@ class TestCellMath(unittest.TestCase):
         self.assertEqual(cellmath.from_address('A1:B2'), (1, 1, 2, 2))
         self.assertEqual(cellmath.from_address('D3:F5'), (3, 4, 5, 6))
 
+    def test_from_address_absolute(self):
+        self.assertEqual(cellmath.from_address('$A$1'), (1, 1))
+        self.assertEqual(cellmath.from_address('$C5'), (5, 3))
+        self.assertEqual(cellmath.from_address('C$5'), (5, 3))
+        self.assertEqual(cellmath.from_address('$A$1:$B$2'), (1, 1, 2, 2))
+        self.assertEqual(cellmath.from_address('D$3:$F5'), (3, 4, 5, 6))
+
+    def test_from_address_lowercase_and_whitespace(self):
+        self.assertEqual(cellmath.from_address('aa10'), (10, 27))
+        self.assertEqual(cellmath.from_address(' C5 '), (5, 3))
+        self.assertEqual(cellmath.from_address('d3:f5'), (3, 4, 5, 6))
+
+    def test_from_address_invalid(self):
+        for address in ('', 'A', '1', '1A', 'A1:', 'A1:B', 'A-1', 'A1B2', 'A1:B2:C3', '$$A1'):
+            with self.assertRaises(ValueError):
+                cellmath.from_address(address)
+
+    def test_columns_beyond_precomputed(self):
+        # columns past MAX_COLUMNS are not in _COL_LETTERS and are converted on the fly
+        self.assertEqual(cellmath.to_address(1, cellmath.MAX_COLUMNS), 'XFD1')
+        self.assertEqual(cellmath.to_address(1, cellmath.MAX_COLUMNS + 1), 'XFE1')
+        self.assertEqual(cellmath.to_address(1, 1, 2, cellmath.MAX_COLUMNS + 1), 'A1:XFE2')
+        self.assertEqual(cellmath.from_address('XFD1'), (1, cellmath.MAX_COLUMNS))
+        self.assertEqual(cellmath.from_address('XFE1'), (1, cellmath.MAX_COLUMNS + 1))
+
     def test_increment_column(self):
         self.assertEqual(cellmath.increment_column('A1', 1), 'B1')
         self.assertEqual(cellmath.increment_column('A1:B2', 2), 'C1:D2')
@@ -0,0 +1,106 @@
+import unittest
+from unittest import mock
+
+from pylab.communication.connection import Connection, Status
+from pylab.devices import base
+from pylab.devices import BK8616, N5770A
+from pylab.devices.bkprecision import BK9129B
+
+class FakeConnection(Connection):
+    """Records writes and answers reads from a queue of responses."""
+    def __init__(self, name, address, **kwargs) -> None:
+        super().__init__(name, address)
+        self.written = []
+        self.responses = []
+
+    def open(self):
+        self._status = Status.OPEN
+        return self._status
+
+    def close(self):
+        self._status = Status.CLOSED
+        return self._status
+
+    def reset(self):
+        return self.open()
+
+    def read(self, *args, **kwargs):
+        return self.responses.pop(0) if self.responses else None
+
+    def write(self, command, *args, **kwargs):
+        self.written.append(command)
+        return True
+
+class MissingQueryN5770A(N5770A):
+    __slots__ = ()
+
+    command_map = {
+        "voltage": ("SOUR:VOLT:LEV:IMM:AMPL", "MEAS:VOLT?"),
+        "current": ("SOUR:CURR:LEV:IMM:AMPL", "MEAS:FOO?"),
+        "power": (None, None),
+    }
+
+class TestMeasureAll(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(base, "getConnection", return_value=FakeConnection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make(self, device_cls, *responses):
+        # no address, so the connection is not pooled between tests
+        device = device_cls("dut", None)
+        device._cnx.responses.extend(responses)
+        return device
+
+    def test_compound_string_and_split(self):
+        device = self.make(N5770A, "1.5;0.25")
+        self.assertEqual(device.measure_all(), {"voltage": "1.5", "current": "0.25"})
+        self.assertEqual(device._cnx.written, ["MEAS:VOLT?;:MEAS:CURR?"])
+
+    def test_entry_without_query_skipped(self):
+        device = self.make(BK8616, "12.0;3.0")
+        self.assertEqual(device.measure_all(), {"voltage": "12.0", "current": "3.0"})
+        self.assertEqual(device._cnx.written, ["MEAS:VOLT?;:MEAS:CURR?"])
+
+    def test_query_missing_from_command_set_skipped(self):
+        with self.assertLogs(base.logger, "WARNING"):
+            device = self.make(MissingQueryN5770A, "1.5")
+            self.assertEqual(device.measure_all(), {"voltage": "1.5"})
+        self.assertEqual(device._cnx.written, ["MEAS:VOLT?"])
+
+    def test_no_query_formats_skipped(self):
+        # SCPI_BK9129B.json has the MEAS commands but no query formats for them yet
+        with self.assertLogs(base.logger, "WARNING"):
+            device = self.make(BK9129B)
+            self.assertEqual(device.measure_all(), {})
+        self.assertEqual(device._cnx.written, [])
+
+    def test_no_response(self):
+        device = self.make(N5770A)
+        self.assertEqual(device.measure_all(), {"voltage": None, "current": None})
+
+    def test_wrong_response_count_logged(self):
+        device = self.make(N5770A, "1.5")
+        with self.assertLogs(base.logger, "ERROR"):
+            self.assertEqual(device.measure_all(), {"voltage": "1.5"})
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(base, "getConnection", return_value=FakeConnection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_write_through_shared_connection_clears_cache(self):
+        first = BK8616("a", "ADDR-shared")
+        second = BK8616("b", "ADDR-shared")
+        self.assertIs(first._cnx, second._cnx)
+        first._cnx.responses.extend(["0", "1"])
+
+        self.assertEqual(first.enabled, "0")
+        self.assertEqual(first.enabled, "0") # served from the cache
+        second.enabled = 1
+        self.assertEqual(first.enabled, "1")
+        self.assertEqual(first._cnx.written, ["INP?", "INP 1", "INP?"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from pylab.communication import scpi
+from pylab.communication.scpi import SCPICommandSet, SCPIArgumentError
+
+DEFINITIONS = {
+    "bool": {"type": "bool"},
+    "int": {"type": "int"},
+    "float": {"type": "float"},
+    "str": {"type": "str"},
+    "int_range": {"type": "int", "range": [1, 4]},
+    "float_open_range": {"type": "float", "range": [0.0, None]},
+    "str_values": {"type": "str", "values": ["VOLT", "CURR"]},
+    "mixed_values": {"type": "bool", "values": [0, 1, "ON", "OFF"]},
+}
+
+# (definition, argument, (is_ok, error_kind)) - results of validate_argument before the
+# validators were precompiled
+CASES = (
+    ("bool", True, (True, None)),
+    ("bool", 0, (True, None)),
+    ("bool", 2, (False, "type")),
+    ("bool", 1.0, (True, None)),
+    ("bool", " on ", (True, None)),
+    ("bool", "yes", (False, "type")),
+    ("bool", None, (False, "type")),
+    ("bool", [1], (False, "type")),
+    ("int", 3, (True, None)),
+    ("int", True, (False, "type")),
+    ("int", 3.0, (False, "type")),
+    ("int", "3", (False, "type")),
+    ("float", 2.5, (True, None)),
+    ("float", 2, (True, None)),
+    ("float", False, (False, "type")),
+    ("float", "2.5", (False, "type")),
+    ("str", "abc", (True, None)),
+    ("str", 1, (False, "type")),
+    ("int_range", 1, (True, None)),
+    ("int_range", 4, (True, None)),
+    ("int_range", 0, (False, "value")),
+    ("int_range", 5, (False, "value")),
+    ("float_open_range", 0.0, (True, None)),
+    ("float_open_range", 1e9, (True, None)),
+    ("float_open_range", -0.1, (False, "value")),
+    ("str_values", "volt", (True, None)),
+    ("str_values", "CURR", (True, None)),
+    ("str_values", "POW", (False, "value")),
+    ("mixed_values", "on", (True, None)),
+    ("mixed_values", 1, (True, None)),
+    ("mixed_values", True, (True, None)),
+    ("mixed_values", "1", (False, "value")),
+)
+
+class TestArgumentValidation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cmd_set = SCPICommandSet("SCPI_N5770A")
+
+    def test_compiled_validators(self):
+        for name, argument, expected in CASES:
+            with self.subTest(definition=name, argument=argument):
+                validator = scpi._compile_argument_validator(DEFINITIONS[name])
+                self.assertEqual(validator(argument), expected)
+
+    def test_validate_argument(self):
+        for name, argument, expected in CASES:
+            with self.subTest(definition=name, argument=argument):
+                self.assertEqual(self.cmd_set.validate_argument(argument, DEFINITIONS[name]), expected)
+
+    def test_definition_errors(self):
+        with self.assertRaises(SCPIArgumentError):
+            self.cmd_set.validate_argument(1, {})
+        with self.assertRaises(SCPIArgumentError):
+            self.cmd_set.validate_argument(1, {"type": "complex"})
+
+    def test_command_set_definitions_reuse_compiled(self):
+        definition = self.cmd_set.get("CAL:LEVel")["set"][0]
+        with mock.patch.object(scpi, "_compile_argument_validator") as compile_validator:
+            self.assertEqual(self.cmd_set.validate_argument("p1", definition), (True, None))
+            self.assertEqual(self.cmd_set.validate_argument("P3", definition), (False, "value"))
+        compile_validator.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+try:
+    import scpi2json
+except ImportError: # needs PyMuPDF
+    scpi2json = None
+
+@unittest.skipIf(scpi2json is None, "PyMuPDF not installed")
+class TestSCPIHeader(unittest.TestCase):
+    def assertHeaders(self, headers, valid):
+        for header in headers:
+            with self.subTest(header=header):
+                self.assertEqual(bool(scpi2json.SCPI_RE.fullmatch(header)), valid)
+
+    def test_plain(self):
+        self.assertHeaders([":SOURce:VOLTage", "MEAS:VOLT?", "OUTP"], True)
+
+    def test_bracketed_root(self):
+        self.assertHeaders(["[SOURce:]VOLTage", "[:SOURce]:CURRent", "[SOURce:]VOLTage[:LEVel]?"], True)
+
+    def test_bracketed_leaf(self):
+        self.assertHeaders(["VOLTage[:LEVel]", "SOURce:VOLTage[:LEVel][:IMMediate][:AMPLitude]?"], True)
+
+    def test_common(self):
+        self.assertHeaders(["*IDN?", "*RST", "*OPC?"], True)
+
+    def test_numeric_suffix(self):
+        self.assertHeaders(["OUTPut<n>", "OUTPut<n>:STATe?", "SOURce<ch>:VOLTage"], True)
+
+    def test_invalid(self):
+        self.assertHeaders(["", "?", ":", "not scpi", "VOLT 5", "VOLT::CURR", "[VOLT", "*"], False)
+
+    def test_long_invalid_fails_fast(self):
+        self.assertHeaders(["A" * 5000 + "!", "Ab:" * 2000 + "!", "[Ab:]" * 2000 + "!"], False)
+
+@unittest.skipIf(scpi2json is None, "PyMuPDF not installed")
+class TestPrefilter(unittest.TestCase):
+    def test_prefixed_mnemonics(self):
+        self.assertTrue(scpi2json._likely_scpi_chunk("SOUR:VOLT 5\n:OUTP ON\n*RST\n"))
+
+    def test_bare_mnemonics(self):
+        self.assertTrue(scpi2json._likely_scpi_chunk("VOLTage <value>\nCURRent <value>\nOUTPut ON|OFF\n"))
+
+    def test_prose_skipped(self):
+        self.assertFalse(scpi2json._likely_scpi_chunk("This chapter describes the front panel. See page 12."))
+        self.assertFalse(scpi2json._likely_scpi_chunk(""))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import datetime
+import math
+import unittest
+
+from pylab.fileio.excel.workbook import _to_cell_value
+
+try:
+    import numpy
+    import pandas
+except ImportError:
+    numpy = pandas = None
+
+class TestToCellValue(unittest.TestCase):
+    def assertDateTime(self, value, expected):
+        self.assertIsInstance(value, datetime.datetime)
+        self.assertEqual(value.timetuple()[:6], expected.timetuple()[:6])
+
+    def test_plain_values_unchanged(self):
+        self.assertEqual(_to_cell_value("abc"), "abc")
+        self.assertEqual(_to_cell_value(3), 3)
+        self.assertEqual(_to_cell_value(2.5), 2.5)
+        self.assertIsNone(_to_cell_value(None))
+
+    def test_nan_is_empty(self):
+        self.assertIsNone(_to_cell_value(math.nan))
+
+    def test_datetime(self):
+        when = datetime.datetime(2024, 5, 6, 7, 8, 9)
+        self.assertDateTime(_to_cell_value(when), when)
+
+    @unittest.skipIf(numpy is None, "numpy/pandas not installed")
+    def test_numpy_scalars(self):
+        self.assertIs(type(_to_cell_value(numpy.int64(4))), int)
+        self.assertIs(type(_to_cell_value(numpy.float64(1.5))), float)
+        self.assertIsNone(_to_cell_value(numpy.float64("nan")))
+
+    @unittest.skipIf(numpy is None, "numpy/pandas not installed")
+    def test_datetime64(self):
+        when = datetime.datetime(2024, 5, 6, 7, 8, 9)
+        self.assertDateTime(_to_cell_value(numpy.datetime64("2024-05-06T07:08:09", "ns")), when)
+        self.assertDateTime(_to_cell_value(numpy.datetime64("2024-05-06", "D")), datetime.datetime(2024, 5, 6))
+        self.assertIsNone(_to_cell_value(numpy.datetime64("NaT")))
+
+    @unittest.skipIf(pandas is None, "numpy/pandas not installed")
+    def test_pandas_missing_values(self):
+        self.assertIsNone(_to_cell_value(pandas.NA))
+        self.assertIsNone(_to_cell_value(pandas.NaT))
+
+    @unittest.skipIf(pandas is None, "numpy/pandas not installed")
+    def test_pandas_timestamp(self):
+        when = datetime.datetime(2024, 5, 6, 7, 8, 9)
+        self.assertDateTime(_to_cell_value(pandas.Timestamp(when)), when)
+
+    @unittest.skipIf(pandas is None, "numpy/pandas not installed")
+    def test_nullable_dataframe_rows(self):
+        df = pandas.DataFrame({
+            "i": pandas.array([1, None], dtype="Int64"),
+            "s": pandas.array(["a", None], dtype="string"),
+            "b": pandas.array([True, None], dtype="boolean"),
+            "t": pandas.to_datetime(["2024-05-06", None]),
+        })
+        rows = [tuple(map(_to_cell_value, row)) for row in df.itertuples(index=False, name=None)]
+        self.assertEqual(rows[0][:3], (1, "a", True))
+        self.assertDateTime(rows[0][3], datetime.datetime(2024, 5, 6))
+        self.assertEqual(rows[1], (None, None, None, None))
+
+if __name__ == '__main__':
+    unittest.main()